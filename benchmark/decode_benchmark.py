@@ -0,0 +1,78 @@
+"""Microbenchmark of the register decoding.
+
+Compares decoding the registers of a block one by one with the scalar
+decoders against decoding the whole block with NumPy.
+
+Run from the repository root:
+    python -m benchmark.decode_benchmark
+"""
+
+import random
+import timeit
+
+from custom_components.weishaupt_modbus.const import FORMATS
+from custom_components.weishaupt_modbus.decoders import decode_words, get_decoder
+
+FORMAT_LIST = [FORMATS.TEMPERATUR, FORMATS.PERCENTAGE, FORMATS.NUMBER, FORMATS.STATUS]
+SENTINELS = [0x8000, 0x8001, 0xFFFF]
+
+
+def make_block(count: int) -> tuple[list[int], list[str]]:
+    """Return random registers with some sentinels and a format per register."""
+    registers = [
+        random.choice(SENTINELS) if random.random() < 0.1 else random.randint(0, 65535)
+        for _ in range(count)
+    ]
+    formats = [random.choice(FORMAT_LIST) for _ in range(count)]
+    return registers, formats
+
+
+def decode_scalar(registers: list[int], formats: list[str]) -> list:
+    """Decode register by register, like single register reads."""
+    return [
+        get_decoder(mformat)(val)
+        for val, mformat in zip(registers, formats, strict=True)
+    ]
+
+
+def decode_vectorized(registers: list[int], formats: list[str]) -> list:
+    """Decode the whole block at once, like block reads."""
+    decoded = decode_words(registers)
+    states = []
+    for offset, mformat in enumerate(formats):
+        if mformat in decoded:
+            values, invalid = decoded[mformat]
+            states.append(None if invalid[offset] else values[offset])
+        else:
+            states.append(registers[offset])
+    return states
+
+
+def decode_words_only(registers: list[int]) -> None:
+    """Decode the whole block at once, without handing the values to items."""
+    decode_words(registers)
+
+
+def main() -> None:
+    """Run the benchmark for some block sizes."""
+    random.seed(1)
+    print(f"{'registers':>9} {'scalar us':>10} {'numpy us':>10} {'decode only':>12}")
+    for count in (1, 10, 50, 125, 1000):
+        registers, formats = make_block(count)
+        assert decode_scalar(registers, formats) == decode_vectorized(
+            registers, formats
+        )
+        number = 2000
+        scalar = timeit.timeit(lambda: decode_scalar(registers, formats), number=number)
+        vectorized = timeit.timeit(
+            lambda: decode_vectorized(registers, formats), number=number
+        )
+        words_only = timeit.timeit(lambda: decode_words_only(registers), number=number)
+        print(
+            f"{count:>9} {scalar / number * 1e6:>10.1f}"
+            f" {vectorized / number * 1e6:>10.1f} {words_only / number * 1e6:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
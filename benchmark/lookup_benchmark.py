@@ -0,0 +1,66 @@
+"""Microbenchmark of the entity update phase.
+
+Every entity update looks up other items by translation key, for the
+dynamic min/max values and the operands of calculations. Compares the
+former linear scan over all items with the translation key index of the
+coordinator for growing item lists.
+
+Run from the repository root:
+    python -m benchmark.lookup_benchmark
+"""
+
+import copy
+import timeit
+
+from custom_components.weishaupt_modbus.coordinator import build_translation_key_index
+from custom_components.weishaupt_modbus.hpconst import DEVICELISTS
+
+
+def lookups_of(item) -> list[str]:
+    """Return the translation keys an entity update of the item looks up."""
+    if item.params is None:
+        return []
+    return [
+        value
+        for key, value in item.params.items()
+        if key in ("dynamic_min", "dynamic_max") or key.startswith("val_")
+    ]
+
+
+def update_linear(items, lookups) -> None:
+    """Update all entities with the former linear scan."""
+    for keys in lookups:
+        for translation_key in keys:
+            for _useless, item in enumerate(items):
+                if item.translation_key == translation_key:
+                    break
+
+
+def update_indexed(index, lookups) -> None:
+    """Update all entities with the translation key index."""
+    for keys in lookups:
+        for translation_key in keys:
+            index.get(translation_key)
+
+
+def main() -> None:
+    """Run the benchmark for growing item lists."""
+    base_items = [item for device in DEVICELISTS for item in device]
+    print(f"{'items':>6} {'linear ms':>10} {'indexed ms':>11}")
+    for factor in (1, 2, 4, 8):
+        items = base_items + [
+            copy.copy(item) for _ in range(factor - 1) for item in base_items
+        ]
+        lookups = [lookups_of(item) for item in items]
+        index = build_translation_key_index(items)
+        number = 20
+        linear = timeit.timeit(lambda: update_linear(items, lookups), number=number)
+        indexed = timeit.timeit(lambda: update_indexed(index, lookups), number=number)
+        print(
+            f"{len(items):>6} {linear / number * 1e3:>10.2f}"
+            f" {indexed / number * 1e3:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Memory report of the item catalogue.
+
+Measures with tracemalloc the memory allocated by building the item
+catalogue in hpconst.py, and compares the copies of the heating circuit
+items made with ModbusItem.clone against deep copies.
+
+The integration already imports hpconst with the package, so the catalogue
+is built anew from hpconst.py into a module of its own to measure it.
+
+Run from the repository root:
+    python -m benchmark.memory_report
+"""
+
+import copy
+import importlib.util
+import tracemalloc
+
+from custom_components.weishaupt_modbus import hpconst
+from custom_components.weishaupt_modbus.const import DEVICES
+
+
+def measure(function) -> tuple[int, object]:
+    """Return the memory in bytes still allocated after running a function."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = function()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename")), result
+
+
+def build_catalogue():
+    """Build the item catalogue from hpconst.py into a new module."""
+    spec = importlib.util.spec_from_file_location(
+        f"{hpconst.__package__}.catalogue", hpconst.__file__
+    )
+    catalogue = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(catalogue)
+    return catalogue
+
+
+def main() -> None:
+    """Print the report."""
+    # the first build compiles hpconst.py, it is not part of the catalogue
+    build_catalogue()
+    size, catalogue = measure(build_catalogue)
+
+    devices = (DEVICES.HZ2, DEVICES.HZ3, DEVICES.HZ4, DEVICES.HZ5)
+    hz_items = catalogue.MODBUS_HZ_ITEMS
+    deep, _copies = measure(
+        lambda: [copy.deepcopy(item) for _ in devices for item in hz_items]
+    )
+    clones, _copies = measure(
+        lambda: [
+            item.clone(item.address + 100, item.name, device)
+            for device in devices
+            for item in hz_items
+        ]
+    )
+    print(f"item catalogue:            {size / 1024:8.1f} KiB")
+    print(f"  with deep copies:        {(size - clones + deep) / 1024:8.1f} KiB")
+    print(f"HZ2..HZ5 as deep copies:   {deep / 1024:8.1f} KiB")
+    print(f"HZ2..HZ5 as clones:        {clones / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
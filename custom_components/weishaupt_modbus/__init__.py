@@ -18,6 +18,7 @@ from .hpconst import (
     MODBUS_HZ5_ITEMS,
     MODBUS_HZ_ITEMS,
     MODBUS_IO_ITEMS,
+    MODBUS_ITEMS,
     MODBUS_ST_ITEMS,
     MODBUS_SYS_ITEMS,
     MODBUS_W2_ITEMS,
@@ -28,6 +29,7 @@ from .items import ModbusItem, StatusItem
 from .kennfeld import PowerMap
 from .migrate_helpers import migrate_entities
 from .modbusobject import ModbusAPI
+from .services import async_setup_services
 from .webif_object import WebifConnection
 
 logging.basicConfig()
@@ -57,16 +59,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyConfigEntry) -> bool:
     else:
         webapi = None
 
-    itemlist = []
-
-    for device in DEVICELISTS:
-        for item in device:
-            itemlist.append(item)
-
     coordinator = MyCoordinator(
-        hass=hass, my_api=mbapi, api_items=itemlist, p_config_entry=entry
+        hass=hass, my_api=mbapi, api_items=MODBUS_ITEMS, p_config_entry=entry
     )
+    # the first refresh restores the stored probe results, with a match it
+    # does not poll and the entities are created from them right away
     await coordinator.async_config_entry_first_refresh()
+    # one probe pass with block reads, shared by the setup of all platforms
+    await coordinator.async_probe_availability()
 
     entry.runtime_data = MyData(
         modbus_api=mbapi,
@@ -103,6 +103,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyConfigEntry) -> bool:
     hass.add_job(migrate_entities, entry, MODBUS_IO_ITEMS, DEVICENAMES.IO)
     hass.add_job(migrate_entities, entry, MODBUS_ST_ITEMS, DEVICENAMES.ST)
 
+    async_setup_services(hass)
+
     # see https://community.home-assistant.io/t/config-flow-how-to-update-an-existing-entity/522442/8
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
@@ -42,15 +42,69 @@ class MainConstants:
 
     DOMAIN = "weishaupt_modbus"
     SCAN_INTERVAL = timedelta(seconds=30)
+    # the coordinator ticks with this interval and polls the items that are due
+    SCAN_TICK = timedelta(seconds=5)
+    # adaptive polling: stretch the scan interval of items that do not change
+    ADAPTIVE_POLLING = True
+    ADAPTIVE_STEADY_CYCLES = 3
+    # holding registers only change by writes, they are revalidated slowly
+    HOLDING_SCAN_INTERVAL = timedelta(minutes=10)
+    # connection handling, delays and timeout in seconds
+    CONNECT_TIMEOUT = 5
+    RECONNECT_DELAY_MIN = 1
+    RECONNECT_DELAY_MAX = 300
+    # time budget of a poll cycle in seconds, the rest is read in the next cycle
+    POLL_BUDGET = 10
+    # time budget of the availability probe at setup in seconds
+    PROBE_BUDGET = 30
+    # first and maximum re-probe delay of invalid registers in seconds per reason
+    REPROBE_DELAYS = {
+        "illegal_address": (3600, 86400),
+        "no_sensor": (300, 21600),
+    }
+    # writes to the same register within this time in seconds are coalesced
+    WRITE_DEBOUNCE = 0.5
+    # version of the stored probe results
+    PROBE_CACHE_VERSION = 1
     UNIQUE_ID = "unique_id"
     APPID = 100
     DEF_KENNFELDFILE = "weishaupt_wbb_kennfeld.json"
     DEF_PREFIX = "weishaupt_wbb"
+    # modbus limit for a single read request (function code 3 and 4)
+    MAX_BLOCK_SIZE = 125
+    # modbus limit for a single write request (function code 16)
+    MAX_WRITE_BLOCK_SIZE = 123
+    # number of unused registers a block read may span to merge two ranges
+    MAX_READ_GAP = 10
 
 
 CONST = MainConstants()
 
 
+@dataclass(frozen=True)
+class PriorityConstants:
+    """Modbus request priorities, lower values are served first."""
+
+    WRITE = 0
+    REFRESH = 1
+    POLL = 2
+
+
+PRIOS = PriorityConstants()
+
+
+@dataclass(frozen=True)
+class ServiceConstants:
+    """Service constants."""
+
+    REFRESH = "refresh"
+    WRITE_REGISTERS = "write_registers"
+    ATTR_VALUES = "values"
+
+
+SERVICES = ServiceConstants()
+
+
 @dataclass(frozen=True)
 class FormatConstants:
     """Format constants."""
@@ -79,6 +133,54 @@ class TypeConstants:
 TYPES = TypeConstants()
 
 
+@dataclass(frozen=True)
+class RegisterTypeConstants:
+    """Register type constants."""
+
+    INPUT = "input"
+    HOLDING = "holding"
+
+
+REGTYPES = RegisterTypeConstants()
+
+
+@dataclass(frozen=True)
+class ReadResultConstants:
+    """Block read result constants."""
+
+    OK = "ok"
+    ILLEGAL_ADDRESS = "illegal_address"
+    FAILED = "failed"
+
+
+READRESULTS = ReadResultConstants()
+
+
+@dataclass(frozen=True)
+class InvalidReasonConstants:
+    """Reasons why a register is invalid."""
+
+    # the heatpump does not know the address
+    ILLEGAL_ADDRESS = "illegal_address"
+    # the register answers with the value of a missing or broken sensor
+    NO_SENSOR = "no_sensor"
+
+
+REASONS = InvalidReasonConstants()
+
+
+@dataclass(frozen=True)
+class RegisterStatusConstants:
+    """Status of a register in the register image."""
+
+    UNREAD = 0
+    VALID = 1
+    INVALID = 2
+
+
+REGSTATUS = RegisterStatusConstants()
+
+
 @dataclass(frozen=True)
 class DeviceConstants:
     """Device constants."""
@@ -1,18 +1,27 @@
 """The Update Coordinator for the ModbusItems."""
 
 import asyncio
+from collections.abc import Callable
 from datetime import timedelta
 import logging
 
 from pymodbus import ModbusException
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .configentry import MyConfigEntry
-from .const import CONST, TYPES, DEVICES, CONF
+from .const import CONST, TYPES, DEVICES, CONF, PRIOS, REASONS, REGSTATUS, REGTYPES
+from .hpconst import MODBUS_CONFIG_ITEMS
 from .items import ModbusItem
+from .migrate_helpers import create_unique_id
 from .modbusobject import ModbusAPI, ModbusObject
+from .modbusplan import ReadPlanner, ReadSet, plan_writes
+from .probecache import ProbeCache, create_fingerprint
+from .registerimage import RegisterImage, RegisterSnapshot
+from .scheduler import PollScheduler
 from .webif_object import WebifConnection
 
 logging.basicConfig()
@@ -24,6 +33,17 @@ async def check_configured(
 ) -> bool:
     """Check if item is configured.
 
+    :param modbus_item: definition of modbus item
+    :type modbus_item: ModbusItem
+    :param config_entry: HASS config entry
+    :type config_entry: MyConfigEntry
+    """
+    return is_configured(modbus_item, config_entry)
+
+
+def is_configured(modbus_item: ModbusItem, config_entry: MyConfigEntry) -> bool:
+    """Check if item is configured, without awaiting.
+
     :param modbus_item: definition of modbus item
     :type modbus_item: ModbusItem
     :param config_entry: HASS config entry
@@ -40,6 +60,22 @@ async def check_configured(
     return True
 
 
+def build_translation_key_index(
+    modbus_items: list[ModbusItem],
+) -> dict[str, ModbusItem]:
+    """Index the items by translation key, the first item of a key wins.
+
+    The items of HZ2..HZ5 share the translation keys of HZ.
+
+    :param modbus_items: the modbus items
+    :type modbus_items: list[ModbusItem]
+    """
+    index: dict[str, ModbusItem] = {}
+    for item in modbus_items:
+        index.setdefault(item.translation_key, item)
+    return index
+
+
 class MyCoordinator(DataUpdateCoordinator):
     """My custom coordinator."""
 
@@ -57,33 +93,617 @@ class MyCoordinator(DataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name="weishaupt-coordinator",
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=CONST.SCAN_INTERVAL,
-            # Set always_update to `False` if the data returned from the
-            # api can be compared via `__eq__` to avoid duplicate updates
-            # being dispatched to listeners
-            always_update=True,
+            # Each tick only polls the items whose scan interval has elapsed.
+            update_interval=CONST.SCAN_TICK,
+            # the snapshots compare their registers, unchanged cycles are
+            # not dispatched to the listeners
+            always_update=False,
         )
         self._modbus_api = my_api
         self._device = None
         self._modbusitems = api_items
         self._number_of_items = len(api_items)
         self._config_entry = p_config_entry
+        self._planner = ReadPlanner(host=p_config_entry.data[CONF.HOST])
+        self._scheduler = PollScheduler()
+        # raw registers of the heatpump, the entities read its snapshot
+        self._image = RegisterImage(api_items)
+        # the items of each register, to map changed registers to items
+        self._items_by_register: dict[tuple[str, int], list[ModbusItem]] = {}
+        for item in api_items:
+            self._items_by_register.setdefault(
+                (item.register_type, item.address), []
+            ).append(item)
+        # items by translation key, rebuilt with the coordinator on reload
+        self._translation_keys = build_translation_key_index(api_items)
+        # the items each item reads and the items reading it, resolved once
+        self._dependencies: dict[ModbusItem, set[ModbusItem]] = {}
+        self._dependents: dict[ModbusItem, set[ModbusItem]] = {}
+        self.build_dependencies()
+        # items of entities disabled in the entity registry are not polled
+        self._items_by_unique_id = {
+            create_unique_id(p_config_entry, item): item for item in api_items
+        }
+        self._disabled_items: set[ModbusItem] = set()
+        self._disabled_entity_ids: set[str] = set()
+        # the configured items that are polled, built once per config entry
+        self._poll_plan: tuple[tuple[int, ModbusItem], ...] = ()
+        # the poll plan of the listened contexts, rebuilt when they change
+        self._listened_plan: tuple[frozenset, tuple[tuple[int, ModbusItem], ...]] = (
+            frozenset(),
+            (),
+        )
+        self.build_poll_plan()
+        # user triggered refreshes are served before background polls
+        self._priority = PRIOS.POLL
+        # latest pending (item, value, time of the write) and the waiters of
+        # debounced writes per address
+        self._pending_writes: dict[int, tuple[ModbusItem, int, float]] = {}
+        self._write_waiters: dict[int, asyncio.Future] = {}
+        # items that did not fit into the time budget of the last cycle
+        self._skipped: set[ModbusItem] = set()
+        self._cycle_stats = {
+            "due": 0,
+            "refreshed": 0,
+            "failed": 0,
+            "skipped": 0,
+            "changed": 0,
+        }
+        # entities listening to a single item, used to push targeted refreshes
+        self._item_listeners: dict[ModbusItem, list[Callable]] = {}
+        # items changed by the last cycle, None to update all entities
+        self._changed_items: list[ModbusItem] | None = None
+        self._dispatched_success = True
+        # availability of the items by item id, probed once before the platforms
+        self._availability: dict[int, bool] = {}
+        self._probe_cache = ProbeCache(hass, p_config_entry.data[CONF.HOST])
+        # fingerprint of catalogue and configuration, set up before the first
+        # refresh, and if the stored probe results matched it
+        self._fingerprint: str | None = None
+        self._probe_cached = False
+
+    def build_poll_plan(self) -> None:
+        """Build the pre-filtered list of items to poll from the configuration.
+
+        Changes of the config entry reload it, which rebuilds the plan. Items
+        of disabled entities are left out, unless an enabled item depends on
+        them. Changes of the entity registry rebuild the plan.
+        """
+        needed = set(
+            self.with_dependencies(
+                [
+                    item
+                    for item in self._modbusitems
+                    if item not in self._disabled_items
+                ]
+            )
+        )
+        self._poll_plan = tuple(
+            (item.item_id, item)
+            for item in self._modbusitems
+            # At setup the coordinator has to be called before buildentitylist.
+            # Therefore check if we should add HZ2,3,4,5...
+            if is_configured(item, self._config_entry)
+            and item in needed
+            and item.type
+            in (
+                TYPES.SENSOR,
+                TYPES.NUMBER_RO,
+                TYPES.NUMBER,
+                TYPES.SELECT,
+                TYPES.SENSOR_CALC,
+            )
+        )
+        self._listened_plan = (frozenset(), ())
+
+    @callback
+    def async_update_disabled_items(self) -> None:
+        """Read the disabled entities from the entity registry.
+
+        The poll plan is rebuilt when they changed, so re-enabled entities
+        are polled again without reloading the config entry."""
+        registry = er.async_get(self.hass)
+        disabled: set[ModbusItem] = set()
+        self._disabled_entity_ids = set()
+        for reg_entry in er.async_entries_for_config_entry(
+            registry, self._config_entry.entry_id
+        ):
+            if reg_entry.disabled and reg_entry.unique_id in self._items_by_unique_id:
+                disabled.add(self._items_by_unique_id[reg_entry.unique_id])
+                self._disabled_entity_ids.add(reg_entry.entity_id)
+        if disabled == self._disabled_items:
+            return
+        self._disabled_items = disabled
+        self.build_poll_plan()
+        log.info("%s items of disabled entities are not polled", len(disabled))
+
+    @callback
+    def _async_entity_registry_updated(self, event: Event) -> None:
+        """Update the disabled items when an entity of the entry has been changed.
+
+        Events of other config entries are ignored without a rescan."""
+        entity_id = event.data["entity_id"]
+        if event.data["action"] == "remove":
+            # the entry of a removed entity is gone, only disabled ones matter
+            if entity_id in self._disabled_entity_ids:
+                self.async_update_disabled_items()
+            return
+        reg_entry = er.async_get(self.hass).async_get(entity_id)
+        if (
+            reg_entry is None
+            or reg_entry.config_entry_id != self._config_entry.entry_id
+        ):
+            return
+        if event.data["action"] == "update" and not {
+            "disabled_by",
+            "entity_id",
+        }.intersection(event.data.get("changes", {})):
+            return
+        self.async_update_disabled_items()
+
+    def _configured_items(self) -> list[ModbusItem]:
+        """Return the items read from the modbus that are configured."""
+        return [
+            item
+            for item in self._modbusitems
+            if item.register_type is not None
+            and is_configured(item, self._config_entry)
+        ]
+
+    async def _read_unread(
+        self, modbus_items: list[ModbusItem], budget: float = CONST.PROBE_BUDGET
+    ) -> tuple[list[ModbusItem], bool]:
+        """Read the items the register image has no value of with block reads.
+
+        Returns the items that have been unread and if all blocks were read
+        within the time budget.
+
+        :param modbus_items: the items to read
+        :type modbus_items: list[ModbusItem]
+        :param budget: time budget of the reads in seconds
+        :type budget: float"""
+        unread = [
+            item
+            for item in modbus_items
+            if self._image.status(item.register_type, item.address)
+            == REGSTATUS.UNREAD
+        ]
+        failed: list[ModbusItem] = []
+        try:
+            async with asyncio.timeout(budget):
+                for block in self._planner.plan(ReadSet(unread, self._image)):
+                    failed.extend(
+                        await self._planner.read(
+                            self._modbus_api, block, self._priority
+                        )
+                    )
+        except TimeoutError:
+            log.warning("Probing exceeded its time budget of %s s", budget)
+            return unread, False
+        if len(failed) > 0:
+            log.warning("%s items could not be read while probing", len(failed))
+        return unread, len(failed) == 0
+
+    async def async_load_probe_cache(self) -> bool:
+        """Restore the stored probe results before the first refresh.
+
+        The results are used when neither the item catalogue nor the few
+        configuration registers of the heatpump changed. The stored illegal
+        addresses are restored, so the first poll does not bisect them again.
+        Returns True when stored results matched."""
+        configured = self._configured_items()
+        config_items = [item for item in MODBUS_CONFIG_ITEMS if item in configured]
+        _unread, success = await self._read_unread(config_items)
+        if not success:
+            raise ConfigEntryNotReady("The heatpump could not be read")
+        self._fingerprint = create_fingerprint(
+            configured, config_items, self._image.publish()
+        )
+        cached = await self._probe_cache.async_load(self._fingerprint)
+        if cached is None:
+            return False
+
+        self._availability, illegal = cached
+        for key in illegal:
+            self._planner.negative_cache.restore(key, REASONS.ILLEGAL_ADDRESS)
+        self._probe_cached = True
+        log.info("Using the stored availability of %s items", len(self._availability))
+        return True
+
+    async def async_probe_availability(self) -> dict[int, bool]:
+        """Determine once which configured items are available on the heatpump.
+
+        With stored probe results the entities are created right away, the
+        items are read and the results revalidated in the background.
+        Otherwise the items the first refresh has not read, e.g. of disabled
+        entities or skipped by the time budget, are probed now with block
+        reads.
+        Returns the availability by item id, shared by all platforms."""
+        configured = self._configured_items()
+        if not self._probe_cached:
+            if not await self._async_probe(configured):
+                raise ConfigEntryNotReady("The heatpump could not be probed")
+            return self._availability
+
+        # bound to the config entry, so an unload cancels the revalidation
+        self._config_entry.async_create_background_task(
+            self.hass,
+            self._async_revalidate(configured),
+            f"{CONST.DOMAIN} revalidate availability",
+        )
+        return self._availability
+
+    async def _async_probe(self, configured: list[ModbusItem]) -> bool:
+        """Probe the configured items and store the results.
+
+        The availability is kept when a block could not be read, the items
+        of an unreachable heatpump would all look available.
+        Returns False when the heatpump could not be read.
+
+        :param configured: the configured items
+        :type configured: list[ModbusItem]"""
+        unread, success = await self._read_unread(configured)
+        self.async_set_updated_snapshot(self._image.publish(), unread)
+        if not success:
+            return False
+        self._availability = {
+            item.item_id: not self._image.is_invalid(item) for item in configured
+        }
+        log.info(
+            "%s of %s items available, %s probed after the first refresh",
+            sum(self._availability.values()),
+            len(configured),
+            len(unread),
+        )
+        await self._probe_cache.async_save(
+            self._fingerprint,
+            self._availability,
+            self._planner.negative_cache.keys(REASONS.ILLEGAL_ADDRESS),
+        )
+        return True
+
+    async def _async_revalidate(self, configured: list[ModbusItem]) -> None:
+        """Probe the items in the background and reload when availability changed.
+
+        :param configured: the configured items
+        :type configured: list[ModbusItem]"""
+        stored = self._availability
+        if await self._async_probe(configured) and (
+            self._availability != stored
+        ):
+            log.info("Availability of the items changed, reloading the entities")
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+
+    @property
+    def availability(self) -> dict[int, bool]:
+        """Return the probed availability of the configured items by item id."""
+        return self._availability
+
+    def get_state(self, modbus_item: ModbusItem):
+        """Return the state of an item in the snapshot of this heatpump.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem"""
+        if self.data is None:
+            return None
+        return self.data.state(modbus_item)
+
+    @callback
+    def async_add_item_listener(
+        self, modbus_item: ModbusItem, update_callback: Callable
+    ) -> CALLBACK_TYPE:
+        """Listen for targeted refreshes of a single item.
+
+        Returns a function that removes the listener.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem
+        :param update_callback: called when the item has been refreshed
+        :type update_callback: Callable"""
+        listeners = self._item_listeners.setdefault(modbus_item, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_item_listeners(self, modbus_items: list[ModbusItem]) -> None:
+        """Push the state of some items to their entities only.
+
+        :param modbus_items: items that have been refreshed
+        :type modbus_items: list[ModbusItem]"""
+        for item in modbus_items:
+            for update_callback in list(self._item_listeners.get(item, [])):
+                update_callback()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the entities of the items changed by the last cycle only.
+
+        All entities are updated after the first refresh and when the
+        availability of the coordinator changes."""
+        if (
+            self._changed_items is None
+            or self.last_update_success != self._dispatched_success
+        ):
+            self._dispatched_success = self.last_update_success
+            super().async_update_listeners()
+            return
+        self.async_update_item_listeners(self._changed_items)
+
+    def changed_items(self, snapshot: RegisterSnapshot) -> list[ModbusItem] | None:
+        """Return the items whose registers differ from the current data.
 
-    async def get_value(self, modbus_item: ModbusItem):
-        """Read a value from the modbus."""
+        The items depending on them, e.g. calculated sensors, are included.
+        Returns None when there is no data to compare with yet.
+
+        :param snapshot: the new snapshot of the register image
+        :type snapshot: RegisterSnapshot"""
+        if self.data is None:
+            return None
+        changed: set[ModbusItem] = set()
+        for key in snapshot.changed(self.data):
+            changed.update(self._items_by_register.get(key, []))
+        return list(self._closure(changed, self._dependents))
+
+    @staticmethod
+    def _references(modbus_item: ModbusItem) -> set[str]:
+        """Return the translation keys an item depends on.
+
+        Dependencies are declared in the params dynamic_min, dynamic_max
+        and val_n of the calculations."""
+        if modbus_item.params is None:
+            return set()
+        return {
+            value
+            for key, value in modbus_item.params.items()
+            if key in ("dynamic_min", "dynamic_max") or key.startswith("val_")
+        }
+
+    def build_dependencies(self) -> None:
+        """Resolve the references of all items into dependency maps.
+
+        References are resolved by translation key like get_value_from_item,
+        the first item of a key wins. The items of HZ2..HZ5 therefore read
+        the referenced items of HZ, as their entities do."""
+        self._dependencies = {}
+        self._dependents = {}
+        for item in self._modbusitems:
+            for key in self._references(item):
+                other = self._translation_keys.get(key)
+                if other is None or other is item:
+                    continue
+                self._dependencies.setdefault(item, set()).add(other)
+                self._dependents.setdefault(other, set()).add(item)
+
+    @staticmethod
+    def _closure(
+        modbus_items: set[ModbusItem], graph: dict[ModbusItem, set[ModbusItem]]
+    ) -> set[ModbusItem]:
+        """Return the items with all items reachable from them in a graph."""
+        closure = set(modbus_items)
+        pending = list(closure)
+        while len(pending) > 0:
+            for other in graph.get(pending.pop(), ()):
+                if other not in closure:
+                    closure.add(other)
+                    pending.append(other)
+        return closure
+
+    def related_items(self, modbus_items: list[ModbusItem]) -> list[ModbusItem]:
+        """Return the items with the items they depend on or that depend on them.
+
+        Items of devices that are not configured, e.g. the heating circuits
+        cloned from the first one, are left out.
+
+        :param modbus_items: the items, e.g. that have been written
+        :type modbus_items: list[ModbusItem]"""
+        related = set(modbus_items)
+        for item in modbus_items:
+            related.update(self._dependencies.get(item, ()))
+            related.update(self._dependents.get(item, ()))
+        return [item for item in related if is_configured(item, self._config_entry)]
+
+    def with_dependencies(self, modbus_items: list[ModbusItem]) -> list[ModbusItem]:
+        """Return the items with all items they read their calculations from.
+
+        :param modbus_items: the items, e.g. listened to by entities
+        :type modbus_items: list[ModbusItem]"""
+        return list(self._closure(set(modbus_items), self._dependencies))
+
+    def listened_poll_plan(
+        self, idx: set[int]
+    ) -> tuple[tuple[int, ModbusItem], ...]:
+        """Return the part of the poll plan the entities listen to.
+
+        The items the listened items depend on are polled as well.
+
+        :param idx: global ids of the items listened to
+        :type idx: set[int]"""
+        contexts = frozenset(idx)
+        if self._listened_plan[0] != contexts:
+            listened = [item for item_id, item in self._poll_plan if item_id in idx]
+            needed = set(self.with_dependencies(listened))
+            self._listened_plan = (
+                contexts,
+                tuple(
+                    (item_id, item)
+                    for item_id, item in self._poll_plan
+                    if item in needed
+                ),
+            )
+        return self._listened_plan[1]
+
+    async def refresh_items(self, modbus_items: list[ModbusItem]) -> None:
+        """Re-read some items and their related items and push only those.
+
+        :param modbus_items: the items to refresh, e.g. that have been written
+        :type modbus_items: list[ModbusItem]"""
+        related = [
+            item
+            for item in self.related_items(modbus_items)
+            if not self._planner.is_invalid(item)
+        ]
+        read_set = ReadSet(related, self._image)
+        for block in self._planner.plan(read_set):
+            await self._planner.read(self._modbus_api, block, PRIOS.WRITE)
+        self.async_set_updated_snapshot(self._image.publish(), related)
+
+    async def write_value(self, modbus_item: ModbusItem, value: int) -> bool:
+        """Write a value to the modbus and refresh the item with its related items.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem
+        :param value: The value to write to the modbus
+        :type value: int"""
         mbo = ModbusObject(self._modbus_api, modbus_item)
-        if mbo is None:
-            modbus_item.state = None
-        else:
-            modbus_item.state = await mbo.value
-        return modbus_item.state
+        if await mbo.setvalue(value) is not True:
+            return False
+        self.update_holding_cache(modbus_item.address, mbo.check_valid_response(value))
+        await self.refresh_items([modbus_item])
+        return True
+
+    async def write_values(self, values: list[tuple[ModbusItem, int]]) -> bool:
+        """Write several values with as few requests as possible.
+
+        Contiguous holding registers are written with one request each run.
+        Returns True when all values have been written.
+
+        :param values: items and the values to write
+        :type values: list[tuple[ModbusItem, int]]"""
+        raw_values: dict[int, int] = {}
+        for modbus_item, value in values:
+            if modbus_item.type not in (TYPES.NUMBER, TYPES.SELECT):
+                log.warning("%s is read-only", str(modbus_item.name))
+                return False
+            raw_values[modbus_item.address] = ModbusObject(
+                self._modbus_api, modbus_item
+            ).check_valid_response(value)
+
+        result = True
+        written: list[ModbusItem] = []
+        for address, batch in plan_writes(raw_values):
+            try:
+                if len(batch) == 1:
+                    mbr = await self._modbus_api.write_register(address, batch[0])
+                else:
+                    mbr = await self._modbus_api.write_registers(address, batch)
+            except ModbusException as exc:
+                log.warning(
+                    "ModbusException: Writing %s registers to %s failed: %s",
+                    str(len(batch)),
+                    str(address),
+                    str(exc),
+                )
+                result = False
+                continue
+            if mbr is None or mbr.isError():
+                log.warning(
+                    "Writing %s registers to %s failed: %s",
+                    str(len(batch)),
+                    str(address),
+                    str(mbr),
+                )
+                result = False
+                continue
+            for offset, raw_value in enumerate(batch):
+                self.update_holding_cache(address + offset, raw_value)
+                written.extend(
+                    item
+                    for item, _value in values
+                    if item.address == address + offset and item not in written
+                )
+        await self.refresh_items(written)
+        return result
+
+    async def write_value_debounced(self, modbus_item: ModbusItem, value: int) -> bool:
+        """Write a value after a short quiet period.
+
+        Every write to the same register restarts the quiet period of
+        CONST.WRITE_DEBOUNCE, so a burst of writes is coalesced. Only the latest
+        value is written and refreshed once. All callers get the result of that
+        single write.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem
+        :param value: The value to write to the modbus
+        :type value: int"""
+        address = modbus_item.address
+        self._pending_writes[address] = (modbus_item, value, self.hass.loop.time())
+        waiter = self._write_waiters.get(address)
+        if waiter is None:
+            waiter = self.hass.loop.create_future()
+            self._write_waiters[address] = waiter
+            self.hass.async_create_task(self._flush_write(address))
+        return await asyncio.shield(waiter)
+
+    async def _flush_write(self, address: int) -> None:
+        """Write the latest pending value of a register.
+
+        :param address: address of the holding register
+        :type address: int"""
+        # wait until no write came in for CONST.WRITE_DEBOUNCE
+        while True:
+            written_at = self._pending_writes[address][2]
+            delay = written_at + CONST.WRITE_DEBOUNCE - self.hass.loop.time()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        modbus_item, value, _written_at = self._pending_writes.pop(address)
+        waiter = self._write_waiters.pop(address)
+        result = False
+        try:
+            result = await self.write_value(modbus_item, value)
+        finally:
+            waiter.set_result(result)
+
+    def update_holding_cache(self, address: int, raw_value: int) -> None:
+        """Store a raw holding register value in the image and publish it.
+
+        :param address: address of the holding register
+        :type address: int
+        :param raw_value: raw value of the register
+        :type raw_value: int"""
+        self._image.write(REGTYPES.HOLDING, address, [raw_value])
+        self._image.publish()
+
+    @callback
+    def async_set_updated_snapshot(
+        self, snapshot: RegisterSnapshot, modbus_items: list[ModbusItem]
+    ) -> None:
+        """Make a snapshot the data of the coordinator and push some items only.
+
+        :param snapshot: the published snapshot of the register image
+        :type snapshot: RegisterSnapshot
+        :param modbus_items: items that have been refreshed
+        :type modbus_items: list[ModbusItem]"""
+        self.data = snapshot
+        self.async_update_item_listeners(modbus_items)
+
+    async def async_refresh_holding_registers(self) -> None:
+        """Revalidate the holding register cache from the modbus."""
+        self._scheduler.make_due(
+            [
+                item
+                for item in self._modbusitems
+                if item.register_type == REGTYPES.HOLDING
+            ]
+        )
+        self._priority = PRIOS.REFRESH
+        try:
+            await self.async_refresh()
+        finally:
+            self._priority = PRIOS.POLL
 
     def get_value_from_item(self, translation_key: str) -> int:
         """Read a value from another modbus item"""
-        for _useless, item in enumerate(self._modbusitems):
-            if item.translation_key == translation_key:
-                return item.state
-        return None
+        item = self._translation_keys.get(translation_key)
+        if item is None:
+            return None
+        return self.get_state(item)
 
     async def _async_setup(self):
         """Set up the coordinator.
@@ -94,62 +714,129 @@ class MyCoordinator(DataUpdateCoordinator):
         This method will be called automatically during
         coordinator.async_config_entry_first_refresh.
         """
+        self.async_update_disabled_items()
+        self._config_entry.async_on_unload(
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_registry_updated
+            )
+        )
         await self._modbus_api.connect()
+        await self.async_load_probe_cache()
+
+    async def fetch_data(
+        self, idx=None, budget: float = CONST.POLL_BUDGET
+    ) -> RegisterSnapshot:
+        """Fetch all values from the modbus.
 
-    async def fetch_data(self, idx=None):
-        """Fetch all values from the modbus."""
-        # if idx is not None:
-        if idx is None:
-            # first run: Update all entitiies
-            to_update = tuple(range(len(self._modbusitems)))
-        elif len(idx) == 0:
-            # idx exists but is not yet filled up: Update all entitiys.
-            to_update = tuple(range(len(self._modbusitems)))
+        Blocks are read until the time budget is used up. The results read so
+        far are kept, the skipped items are read first in the next cycle.
+        Returns the published snapshot of the register image.
+
+        :param idx: global ids of the items to poll, all items when empty
+        :type idx: set[int]
+        :param budget: time budget of the cycle in seconds
+        :type budget: float"""
+        if idx is None or len(idx) == 0:
+            # first run or idx not yet filled up: Update all entities
+            poll_plan = self._poll_plan
         else:
-            # idx exists and is filled up: Update only entitys requested by the coordinator.
-            to_update = idx
+            # Update only the items of the listening entities and their dependencies
+            poll_plan = self.listened_poll_plan(idx)
 
-        # await self._modbus_api.connect()
-        for index in to_update:
-            item = self._modbusitems[index]
-            # At setup the coordinator has to be called before buildentitylist.
-            # Therefore check if we should add HZ2,3,4,5...
-            if await check_configured(item, self._config_entry) is True:
-                match item.type:
-                    # here the entities are created with the parameters provided
-                    # by the ModbusItem object
-                    case (
-                        TYPES.SENSOR
-                        | TYPES.NUMBER_RO
-                        | TYPES.NUMBER
-                        | TYPES.SELECT
-                        | TYPES.SENSOR_CALC
-                    ):
-                        await self.get_value(item)
+        # invalid registers are skipped until they are re-probed
+        to_read = [
+            item for _index, item in poll_plan if not self._planner.is_invalid(item)
+        ]
+
+        # only items whose scan interval has elapsed are polled in this tick
+        to_read = self._scheduler.due_items(to_read)
+        previous = self._image.snapshot
+
+        # every register is read once, neighbouring registers with one request
+        read_set = ReadSet(to_read, self._image)
+        blocks = self._planner.plan(read_set)
+        # blocks skipped in the last cycle first, the sort keeps the order otherwise
+        blocks.sort(key=lambda block: self._skipped.isdisjoint(block.items))
+
+        read_items: list[ModbusItem] = []
+        failed_items: list[ModbusItem] = []
+        deadline = asyncio.get_running_loop().time() + budget
+        try:
+            for block in blocks:
+                # each block is queued on its own, so writes can get in between
+                async with asyncio.timeout_at(deadline):
+                    failed = await self._planner.read(
+                        self._modbus_api, block, self._priority
+                    )
+                read_items.extend(item for item in block.items if item not in failed)
+                failed_items.extend(failed)
+        except TimeoutError:
+            log.info("Poll cycle exceeded its time budget, continuing next cycle")
+
+        # the items read from the new snapshot from here on
+        snapshot = self._image.publish()
+
+        for item in read_items:
+            self._scheduler.polled(item, snapshot.state(item), previous.state(item))
+
+        # items of unread or failed blocks stay due and are read first in the
+        # next cycle
+        self._skipped = set(to_read).difference(read_items)
+        self._changed_items = self.changed_items(snapshot)
+        self._cycle_stats = {
+            "due": len(to_read),
+            "refreshed": len(read_items),
+            "failed": len(failed_items),
+            "skipped": len(self._skipped) - len(failed_items),
+            "changed": (
+                len(self._modbusitems)
+                if self._changed_items is None
+                else len(self._changed_items)
+            ),
+        }
+        return snapshot
+
+    @property
+    def cycle_stats(self) -> dict[str, int]:
+        """Return the number of items of the last cycle.
+
+        Due items are refreshed, failed or skipped for the time budget. The
+        changed items have been dispatched to their entities."""
+        return self._cycle_stats
 
     async def _async_update_data(self):
         """Fetch data from API endpoint.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
+        Returns an immutable snapshot of the register image.
         """
-        # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-        # handled by the data update coordinator.
-        async with asyncio.timeout(10):
-            # Grab active context variables to limit data required to be fetched from API
-            # Note: using context is not required if there is no need or ability to limit
-            # data retrieved from API.
-            try:
-                # listening_idx = set(self.async_contexts())
-                return await self.fetch_data()  # !!!!!using listening_idx will result in some entities nevwer updated !!!!!
-            except ModbusException:
-                log.warning("connection to the heatpump failed")
+        # Note: the time budget is handled by fetch_data, which publishes
+        # the items read so far instead of dropping the whole cycle.
+        # Grab active context variables to limit data required to be fetched from API
+        # The contexts are the global item ids of the listening entities.
+        if self.data is None and self._probe_cached:
+            # the entities are created from the stored probe results, the
+            # items are read by the revalidation in the background
+            return self._image.snapshot
+        try:
+            listening_idx = set(self.async_contexts())
+            return await self.fetch_data(listening_idx)
+        except ModbusException:
+            log.warning("connection to the heatpump failed")
+            self._changed_items = self.changed_items(self._image.snapshot)
+            return self._image.snapshot
 
     @property
     def modbus_api(self) -> str:
         """Return modbus_api."""
         return self._modbus_api
 
+    @property
+    def modbus_items(self) -> list[ModbusItem]:
+        """Return the modbus items."""
+        return self._modbusitems
+
 
 class MyWebIfCoordinator(DataUpdateCoordinator):
     """My custom coordinator."""
@@ -163,10 +850,9 @@ class MyWebIfCoordinator(DataUpdateCoordinator):
             name="My sensor",
             # Polling interval. Will only be polled if there are subscribers.
             update_interval=timedelta(seconds=60),
-            # Set always_update to `False` if the data returned from the
-            # api can be compared via `__eq__` to avoid duplicate updates
-            # being dispatched to listeners
-            always_update=True,
+            # the info of the web interface is a dict compared via `__eq__`,
+            # unchanged data is not dispatched to the listeners
+            always_update=False,
         )
         self.my_api: WebifConnection = config_entry.runtime_data.webif_api
         # self._device: MyDevice | None = None
@@ -0,0 +1,90 @@
+"""Decoders of raw register values.
+
+Every ModbusItem gets the decoder of its format when the item list is
+built, so a poll decodes the registers without dispatching on the format.
+A decoder returns the state of the item, None when the value marks the
+item as invalid, e.g. a missing sensor.
+The registers of a block read are decoded at once with NumPy, the scalar
+decoders are used for single registers.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+
+from .const import FORMATS
+
+# sentinel values of the heatpump
+TEMPERATURE_NO_SENSOR = 0x8000
+TEMPERATURE_BROKEN = 0x8001
+PERCENTAGE_NO_SENSOR = 0xFFFF
+
+# state shown for a broken temperature sensor
+BROKEN_SENSOR_STATE = -999
+
+
+def decode_raw(val: int) -> int:
+    """Return the raw value, for numbers and status values."""
+    return val
+
+
+def decode_temperature(val: int) -> int | None:
+    """Decode a signed temperature.
+
+    :param val: The value from the modbus
+    :type val: int"""
+    if val < TEMPERATURE_NO_SENSOR:
+        return val
+    if val == TEMPERATURE_NO_SENSOR:
+        # No Sensor installed
+        return None
+    if val == TEMPERATURE_BROKEN:
+        # Sensor broken set return value to -99.9 to inform user
+        return BROKEN_SENSOR_STATE
+    return val - 65536
+
+
+def decode_percentage(val: int) -> int | None:
+    """Decode a percentage.
+
+    :param val: The value from the modbus
+    :type val: int"""
+    if val == PERCENTAGE_NO_SENSOR:
+        return None
+    return val
+
+
+DECODERS: dict[str, Callable[[int], int | None]] = {
+    FORMATS.TEMPERATUR: decode_temperature,
+    FORMATS.PERCENTAGE: decode_percentage,
+}
+
+
+def get_decoder(mformat: str) -> Callable[[int], int | None]:
+    """Return the decoder of a format.
+
+    :param mformat: format of the item
+    :type mformat: str"""
+    return DECODERS.get(mformat, decode_raw)
+
+
+def decode_words(registers: list[int]) -> dict[str, tuple[list[int], list[bool]]]:
+    """Decode the registers of a block for all formats with sentinels at once.
+
+    Returns the values and the invalid flags per format. Formats without
+    sentinels use the raw registers.
+
+    :param registers: the raw registers of a block read
+    :type registers: list[int]"""
+    words = np.asarray(registers, dtype=np.int32)
+
+    temperatures = words - (words > TEMPERATURE_NO_SENSOR) * 65536
+    temperatures[words == TEMPERATURE_BROKEN] = BROKEN_SENSOR_STATE
+
+    return {
+        FORMATS.TEMPERATUR: (
+            temperatures.tolist(),
+            (words == TEMPERATURE_NO_SENSOR).tolist(),
+        ),
+        FORMATS.PERCENTAGE: (registers, (words == PERCENTAGE_NO_SENSOR).tolist()),
+    }
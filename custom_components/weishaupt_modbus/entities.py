@@ -16,7 +16,7 @@ from .coordinator import MyCoordinator, MyWebIfCoordinator
 from .hpconst import reverse_device_list
 from .items import ModbusItem, WebItem
 from .migrate_helpers import create_unique_id
-from .modbusobject import ModbusAPI, ModbusObject
+from .modbusobject import ModbusAPI
 
 logging.basicConfig()
 log = logging.getLogger(__name__)
@@ -76,6 +76,9 @@ class MyEntity(Entity):
         self._dev_translation_placeholders = {"postfix": dev_postfix}
 
         self._attr_unique_id = create_unique_id(self._config_entry, self._api_item)
+        if self._api_item.format == FORMATS.UNKNOWN:
+            # registers of unknown meaning are not polled unless enabled by the user
+            self._attr_entity_registry_enabled_default = False
         self._dev_device = self._api_item.device
 
         self._modbus_api = modbus_api
@@ -105,6 +108,20 @@ class MyEntity(Entity):
             if icon is not None:
                 self._attr_icon = icon
 
+    async def async_added_to_hass(self) -> None:
+        """Listen for targeted refreshes of the modbus item, e.g. after writes.
+
+        The coordinator pushes changed items only, so the current state is
+        taken from its data once when the entity is added."""
+        await super().async_added_to_hass()
+        if isinstance(self._api_item, ModbusItem):
+            self.async_on_remove(
+                self._config_entry.runtime_data.coordinator.async_add_item_listener(
+                    self._api_item, self._handle_coordinator_update
+                )
+            )
+            self._handle_coordinator_update()
+
     def set_min_max(self, onlydynamic: bool = False):
         """sets min max to fixed or dynamic values"""
         if self._api_item.params is None:
@@ -146,17 +163,24 @@ class MyEntity(Entity):
         self.set_min_max(True)
         return val / self._divider
 
-    async def set_translate_val(self, value) -> int:
-        """Translate and writes a value to the modbus."""
+    async def set_translate_val(self, value, debounce: bool = False) -> int:
+        """Translate and writes a value to the modbus.
+
+        :param value: value as shown in HA
+        :param debounce: coalesce a burst of writes, e.g. from a slider
+        :type debounce: bool"""
         if self._api_item.format == FORMATS.STATUS:
             val = self._api_item.get_number_from_translation_key(value)
         else:
             self.set_min_max(True)
             val = int(value * self._divider)
 
-        await self._modbus_api.connect()
-        mbo = ModbusObject(self._modbus_api, self._api_item)
-        await mbo.setvalue(val)
+        # the coordinator updates the state of the item when the write succeeded
+        coordinator = self._config_entry.runtime_data.coordinator
+        if debounce:
+            await coordinator.write_value_debounced(self._api_item, val)
+        else:
+            await coordinator.write_value(self._api_item, val)
         return val
 
     def my_device_info(self) -> DeviceInfo:
@@ -198,7 +222,9 @@ class MySensorEntity(CoordinatorEntity, SensorEntity, MyEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.translate_val(self._api_item.state)
+        self._attr_native_value = self.translate_val(
+            self.coordinator.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     @property
@@ -242,7 +268,9 @@ class MyCalcSensorEntity(MySensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.translate_val(self._api_item.state)
+        self._attr_native_value = self.translate_val(
+            self.coordinator.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     def translate_val(self, val):
@@ -322,14 +350,15 @@ class MyNumberEntity(CoordinatorEntity, NumberEntity, MyEntity):  # pylint: disa
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.translate_val(self._api_item.state)
+        self._attr_native_value = self.translate_val(
+            self.coordinator.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     async def async_set_native_value(self, value: float) -> None:
         """Send value over modbus and refresh HA."""
-        self._api_item.state = await self.set_translate_val(value)
-        self._attr_native_value = self.translate_val(self._api_item.state)
-        self.async_write_ha_state()
+        # the coordinator pushes the confirmed value after the write
+        await self.set_translate_val(value, debounce=True)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -366,14 +395,15 @@ class MySelectEntity(CoordinatorEntity, SelectEntity, MyEntity):  # pylint: disa
 
     async def async_select_option(self, option: str) -> None:
         """Write the selected option to modbus and refresh HA."""
-        self._api_item.state = await self.set_translate_val(option)
-        self._attr_current_option = self.translate_val(self._api_item.state)
-        self.async_write_ha_state()
+        # the coordinator pushes the confirmed value after the write
+        await self.set_translate_val(option)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_current_option = self.translate_val(self._api_item.state)
+        self._attr_current_option = self.translate_val(
+            self.coordinator.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     @property
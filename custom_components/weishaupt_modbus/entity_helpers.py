@@ -3,7 +3,6 @@
 import logging
 from .configentry import MyConfigEntry
 from .items import ModbusItem, WebItem
-from .modbusobject import ModbusObject
 from .const import TYPES
 from .coordinator import MyCoordinator, check_configured
 from .entities import MySensorEntity, MyCalcSensorEntity, MyNumberEntity, MySelectEntity
@@ -15,6 +14,9 @@ log = logging.getLogger(__name__)
 async def check_available(modbus_item: ModbusItem, config_entry: MyConfigEntry) -> bool:
     """function checks if item is valid and available
 
+    The availability is looked up in the map probed by the coordinator at
+    setup.
+
     :param config_entry: HASS config entry
     :type config_entry: MyConfigEntry
     :param modbus_item: definition of modbus item
@@ -23,12 +25,8 @@ async def check_available(modbus_item: ModbusItem, config_entry: MyConfigEntry)
     if await check_configured(modbus_item, config_entry) is False:
         return False
 
-    _modbus_api = config_entry.runtime_data.modbus_api
-    mbo = ModbusObject(_modbus_api, modbus_item)
-    _useless = await mbo.value
-    if modbus_item.is_invalid is False:
-        return True
-    return False
+    availability = config_entry.runtime_data.coordinator.availability
+    return availability.get(modbus_item.item_id, False)
 
 
 async def build_entity_list(
@@ -55,7 +53,10 @@ async def build_entity_list(
     :type coordinator: MyCoordinator
     """
 
-    for index, item in enumerate(api_items):
+    for item in api_items:
+        # the global item id is the context the entity listens with, the
+        # coordinator polls the items of the contexts only
+        index = item.item_id
         if item.type == item_type:
             if await check_available(item, config_entry=config_entry) is True:
                 match item_type:
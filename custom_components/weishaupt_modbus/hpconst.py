@@ -1,6 +1,5 @@
 """Heatpump constants."""
 
-import copy
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import (
     UnitOfTime,
@@ -29,6 +28,39 @@ reverse_device_list: dict[str, str] = {
     "dev_ein_aus": "IO",
 }
 
+# default scan interval in seconds of the items of a device,
+# can be overwritten per item by "scan_interval" in its params
+DEVICE_SCAN_INTERVALS: dict[str, int] = {
+    DEVICES.SYS: 30,
+    DEVICES.WP: 10,
+    DEVICES.WW: 30,
+    DEVICES.HZ: 30,
+    DEVICES.HZ2: 30,
+    DEVICES.HZ3: 30,
+    DEVICES.HZ4: 30,
+    DEVICES.HZ5: 30,
+    DEVICES.W2: 60,
+    DEVICES.ST: 300,
+    DEVICES.UK: 30,
+    DEVICES.IO: 60,
+}
+
+# upper bound of the scan interval in seconds per device in adaptive mode
+DEVICE_SCAN_MAX_INTERVALS: dict[str, int] = {
+    DEVICES.SYS: 300,
+    DEVICES.WP: 120,
+    DEVICES.WW: 300,
+    DEVICES.HZ: 600,
+    DEVICES.HZ2: 600,
+    DEVICES.HZ3: 600,
+    DEVICES.HZ4: 600,
+    DEVICES.HZ5: 600,
+    DEVICES.W2: 900,
+    DEVICES.ST: 1800,
+    DEVICES.UK: 600,
+    DEVICES.IO: 900,
+}
+
 ################################################################################
 # Listen mit Fehlermeldungen, Warnmeldungen und Statustexte
 # Beschreibungstext ist ebenfalls möglich
@@ -1149,6 +1181,11 @@ PARAMS_ALERT: dict = {"icon": "mdi:alert"}
 
 PARAMS_OPMODE: dict = {"icon": "mdi:heat-pump"}
 
+# configuration registers only change when the heatpump is reconfigured
+PARAMS_KONFIG: dict = {"scan_interval": 3600}
+
+PARAMS_OPMODE_KONFIG: dict = {"icon": "mdi:heat-pump", "scan_interval": 3600}
+
 PARAMS_PARTY: dict = {"icon": "mdi:glass-cocktail"}
 
 PARAMS_TIME_H: dict = {"icon": "mdi:clock-time-eight", "unit": UnitOfTime.HOURS}
@@ -1187,7 +1224,7 @@ MODBUS_WP_ITEMS: list[ModbusItem] = [
     ModbusItem( address=33111, name="Vorlauftemperatur präzise(Summenvorlauf(B7))", mformat=FORMATS.TEMPERATUR, mtype=TYPES.SENSOR, device=DEVICES.WP, params=PARAMS_STDTEMP, translation_key="vl_praeziese_summenvorlauf_b7"),
     ModbusItem( address=33111, name="Spreizung", mformat=FORMATS.TEMPERATUR, mtype=TYPES.SENSOR_CALC, device=DEVICES.WP, params=PARAMS_CALCSPREIZUNG, translation_key="spreizung"),
 
-    ModbusItem( address=43101, name="Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.WP, resultlist=HP_KONFIGURATION, params = PARAMS_OPMODE, translation_key="wp_konf"),
+    ModbusItem( address=43101, name="Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.WP, resultlist=HP_KONFIGURATION, params = PARAMS_OPMODE_KONFIG, translation_key="wp_konf"),
     ModbusItem( address=43102, name="Ruhemodus", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.WP, resultlist=HP_RUHEMODUS, translation_key="ruhemodus"),
     ModbusItem( address=43103, name="Pumpe Einschaltart", mformat=FORMATS.NUMBER, mtype=TYPES.NUMBER_RO, device=DEVICES.WP, translation_key="pumpe_einschaltart"),
     ModbusItem( address=43104, name="Sollwert Pumpe Leistung Heizen", mformat=FORMATS.PERCENTAGE, mtype=TYPES.NUMBER_RO, device=DEVICES.WP, params=PARAMS_PERCENTAGE, translation_key="sollwert_pumpe_leistung_heizen"),
@@ -1206,7 +1243,7 @@ MODBUS_HZ_ITEMS = [
     ModbusItem( address=31104, name="Vorlaufsolltemperatur", mformat=FORMATS.TEMPERATUR, mtype=TYPES.SENSOR, device=DEVICES.HZ, params=PARAMS_STDTEMP, translation_key="hz_vl_solltemp"),
     ModbusItem( address=31105, name="Vorlauftemperatur", mformat=FORMATS.TEMPERATUR, mtype=TYPES.SENSOR, device=DEVICES.HZ, params=PARAMS_STDTEMP, translation_key="hz_vl_temp"),
     ModbusItem( address=31106, name="Adr. 31106", mformat=FORMATS.UNKNOWN, mtype=TYPES.SENSOR, device=DEVICES.HZ, translation_key="adr31106"),
-    ModbusItem( address=41101, name="Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.HZ, resultlist=HZ_KONFIGURATION, translation_key="hz_konf"),
+    ModbusItem( address=41101, name="Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.HZ, resultlist=HZ_KONFIGURATION, params=PARAMS_KONFIG, translation_key="hz_konf"),
     ModbusItem( address=41102, name="Anforderung Typ", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.HZ, resultlist=HZ_ANFORDERUNG, translation_key="anf_typ"),
     ModbusItem( address=41103, name="Betriebsart", mformat=FORMATS.STATUS, mtype=TYPES.SELECT, device=DEVICES.HZ, resultlist=HZ_BETRIEBSART, translation_key="hz_operationmode"),
     ModbusItem( address=41104, name="Pause / Party", mformat=FORMATS.STATUS, mtype=TYPES.SELECT, device=DEVICES.HZ, resultlist=HZ_PARTY_PAUSE, params = PARAMS_PARTY, translation_key="party_pause"),
@@ -1223,47 +1260,47 @@ MODBUS_HZ_ITEMS = [
 # buils other Heizkreis Itemlists
 MODBUS_HZ2_ITEMS: list = []
 for item in MODBUS_HZ_ITEMS:
-    mbi = copy.deepcopy(x=item)
-    mbi.address = item.address+100
-    mbi.name = item.name + "2"
+    # the copies share params and result lists with the HZ items
+    mbi = item.clone(
+        address=item.address + 100, name=item.name + "2", device=DEVICES.HZ2
+    )
     #mbi.translation_key = item.translation_key + "2"
-    mbi.device = DEVICES.HZ2
     MODBUS_HZ2_ITEMS.append(mbi)  # noqa: PERF401
 
 # buils other Heizkreis Itemlists
 MODBUS_HZ3_ITEMS: list = []
 for item in MODBUS_HZ_ITEMS:
-    mbi = copy.deepcopy(x=item)
-    mbi.address = item.address+200
-    mbi.name = item.name + "3"
+    # the copies share params and result lists with the HZ items
+    mbi = item.clone(
+        address=item.address + 200, name=item.name + "3", device=DEVICES.HZ3
+    )
     #mbi.translation_key = item.translation_key + "3"
-    mbi.device = DEVICES.HZ3
     MODBUS_HZ3_ITEMS.append(mbi)  # noqa: PERF401
 
 # buils other Heizkreis Itemlists
 MODBUS_HZ4_ITEMS: list = []
 for item in MODBUS_HZ_ITEMS:
-    mbi = copy.deepcopy(x=item)
-    mbi.address = item.address+300
-    mbi.name = item.name + "4"
+    # the copies share params and result lists with the HZ items
+    mbi = item.clone(
+        address=item.address + 300, name=item.name + "4", device=DEVICES.HZ4
+    )
     #mbi.translation_key = item.translation_key + "4"
-    mbi.device = DEVICES.HZ4
     MODBUS_HZ4_ITEMS.append(mbi)  # noqa: PERF401
 
 # buils other Heizkreis Itemlists
 MODBUS_HZ5_ITEMS: list = []
 for item in MODBUS_HZ_ITEMS:
-    mbi: ModbusItem = copy.deepcopy(x=item)
-    mbi.address = item.address+400
-    mbi.name = item.name + "5"
+    # the copies share params and result lists with the HZ items
+    mbi = item.clone(
+        address=item.address + 400, name=item.name + "5", device=DEVICES.HZ5
+    )
     #mbi.translation_key = item.translation_key + "5"
-    mbi.device = DEVICES.HZ5
     MODBUS_HZ5_ITEMS.append(mbi)  # noqa: PERF401
 
 MODBUS_WW_ITEMS: list[ModbusItem] = [
     ModbusItem( address=32101, name="Warmwassersolltemperatur", mformat=FORMATS.TEMPERATUR, mtype=TYPES.SENSOR, device=DEVICES.WW, params=PARAMS_WATERTEMP, translation_key="ww_soll_temp"),
     ModbusItem( address=32102, name="Warmwassertemperatur", mformat=FORMATS.TEMPERATUR, mtype=TYPES.SENSOR, device=DEVICES.WW, params=PARAMS_WATERTEMP, translation_key="ww_temp"),
-    ModbusItem( address=42101, name="Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.WW, resultlist=WW_KONFIGURATION, translation_key="ww_konf"),
+    ModbusItem( address=42101, name="Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.WW, resultlist=WW_KONFIGURATION, params=PARAMS_KONFIG, translation_key="ww_konf"),
     ModbusItem( address=42102, name="Warmwasser Push", mformat=FORMATS.STATUS, mtype=TYPES.SELECT, device=DEVICES.WW, resultlist=WW_PUSH, translation_key="ww_push"),
     ModbusItem( address=42103, name="Warmwasser Normal", mformat=FORMATS.TEMPERATUR, mtype=TYPES.NUMBER, device=DEVICES.WW, params=PARAMS_WATERTEMP_HIGH, translation_key="ww_normal"),
     ModbusItem( address=42104, name="Warmwasser Absenk", mformat=FORMATS.TEMPERATUR, mtype=TYPES.NUMBER, device=DEVICES.WW, params=PARAMS_WATERTEMP_LOW, translation_key="ww_absenk"),
@@ -1278,9 +1315,9 @@ MODBUS_W2_ITEMS: list[ModbusItem] = [
     ModbusItem( address=34105, name="Status E-Heizung 2", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.W2, resultlist=W2_STATUS, translation_key="status_e2"),
     ModbusItem( address=34106, name="Schaltspiele E-Heizung 2", mformat=FORMATS.NUMBER, mtype=TYPES.SENSOR, device=DEVICES.W2, translation_key="schaltsp_e2"),
     ModbusItem( address=34107, name="Betriebsstunden E2", mformat=FORMATS.NUMBER, mtype=TYPES.SENSOR, device=DEVICES.W2, params = PARAMS_TIME_H, translation_key="betriebss_e2"),
-    ModbusItem( address=44101, name="W2_Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.W2, resultlist=W2_KONFIG, translation_key="w2_konf"),
-    ModbusItem( address=44102, name="Konfiguration EP1", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.W2, resultlist=EP1_KONFIG, translation_key="adr44102"),
-    ModbusItem( address=44103, name="Konfiguration EP2", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.W2, resultlist=EP2_KONFIG, translation_key="adr44103"),
+    ModbusItem( address=44101, name="W2_Konfiguration", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.W2, resultlist=W2_KONFIG, params=PARAMS_KONFIG, translation_key="w2_konf"),
+    ModbusItem( address=44102, name="Konfiguration EP1", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.W2, resultlist=EP1_KONFIG, params=PARAMS_KONFIG, translation_key="adr44102"),
+    ModbusItem( address=44103, name="Konfiguration EP2", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.W2, resultlist=EP2_KONFIG, params=PARAMS_KONFIG, translation_key="adr44103"),
     ModbusItem( address=44104, name="Grenztemperatur", mformat=FORMATS.TEMPERATUR, mtype=TYPES.NUMBER, device=DEVICES.W2, params=PARAMS_BIVALENZTEMP, translation_key="grenztemp"),
     ModbusItem( address=44105, name="Bivalenztemperatur", mformat=FORMATS.TEMPERATUR, mtype=TYPES.NUMBER, device=DEVICES.W2, params=PARAMS_BIVALENZTEMP, translation_key="bivalenztemp"),
     ModbusItem( address=44106, name="Bivalenztemperatur WW", mformat=FORMATS.TEMPERATUR, mtype=TYPES.NUMBER, device=DEVICES.W2, params=PARAMS_BIVALENZTEMP, translation_key="bivalenztemp_ww"),
@@ -1333,14 +1370,14 @@ MODBUS_IO_ITEMS: list[ModbusItem] = [
     ModbusItem( address=35107, name="Eingang DE1", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.IO, resultlist=W2_STATUS, translation_key="eing_de1"),
     ModbusItem( address=35108, name="Eingang DE2", mformat=FORMATS.STATUS, mtype=TYPES.SENSOR, device=DEVICES.IO, resultlist=W2_STATUS, translation_key="eing_de2"),
 
-    ModbusItem( address=45101, name="Konf. Eingang SGR1", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, translation_key="konf_eing_sgr1"),
-    ModbusItem( address=45102, name="Konf. Eingang SGR2", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, translation_key="konf_eing_sgr2"),
-    ModbusItem( address=45103, name="Konf. Ausgang H1.2", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, translation_key="konf_ausg_h12"),
-    ModbusItem( address=45104, name="Konf. Ausgang  H1.3", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, translation_key="konf_ausg_h13"),
-    ModbusItem( address=45105, name="Konf. Ausgang  H1.4", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, translation_key="konf_ausg_h14"),
-    ModbusItem( address=45106, name="Konf. Ausgang  H1.5", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, translation_key="konf_ausg_h15"),
-    ModbusItem( address=45107, name="Konf. Eingang DE1", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, translation_key="konf_eing_de1"),
-    ModbusItem( address=45108, name="Konf. Eingang DE2", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, translation_key="konf_eing_de2"),
+    ModbusItem( address=45101, name="Konf. Eingang SGR1", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, params=PARAMS_KONFIG, translation_key="konf_eing_sgr1"),
+    ModbusItem( address=45102, name="Konf. Eingang SGR2", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, params=PARAMS_KONFIG, translation_key="konf_eing_sgr2"),
+    ModbusItem( address=45103, name="Konf. Ausgang H1.2", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, params=PARAMS_KONFIG, translation_key="konf_ausg_h12"),
+    ModbusItem( address=45104, name="Konf. Ausgang  H1.3", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, params=PARAMS_KONFIG, translation_key="konf_ausg_h13"),
+    ModbusItem( address=45105, name="Konf. Ausgang  H1.4", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, params=PARAMS_KONFIG, translation_key="konf_ausg_h14"),
+    ModbusItem( address=45106, name="Konf. Ausgang  H1.5", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG, params=PARAMS_KONFIG, translation_key="konf_ausg_h15"),
+    ModbusItem( address=45107, name="Konf. Eingang DE1", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, params=PARAMS_KONFIG, translation_key="konf_eing_de1"),
+    ModbusItem( address=45108, name="Konf. Eingang DE2", mformat=FORMATS.STATUS, mtype=TYPES.NUMBER_RO, device=DEVICES.IO, resultlist=IO_KONFIG_IN, params=PARAMS_KONFIG, translation_key="konf_eing_de2"),
 ]
 
 
@@ -1367,4 +1404,26 @@ DEVICELISTS: list = [
     MODBUS_IO_ITEMS
 ]
 
+# all modbus items, the index is the global id of the item and the context
+# its entity listens to the coordinator with
+MODBUS_ITEMS: list[ModbusItem] = [item for device in DEVICELISTS for item in device]
+for item_id, item in enumerate(MODBUS_ITEMS):
+    item.item_id = item_id
+
+# the configuration registers of the heatpump, their values are part of the
+# fingerprint of the persisted probe results
+CONFIG_RESULTLISTS = (
+    HP_KONFIGURATION,
+    HZ_KONFIGURATION,
+    WW_KONFIGURATION,
+    W2_KONFIG,
+    EP1_KONFIG,
+    EP2_KONFIG,
+)
+MODBUS_CONFIG_ITEMS: list[ModbusItem] = [
+    item
+    for item in MODBUS_ITEMS
+    if any(item.resultlist is resultlist for resultlist in CONFIG_RESULTLISTS)
+]
+
 # fmt: on
@@ -1,6 +1,16 @@
 """Item classes."""
 
-from .const import TYPES, FORMATS, DeviceConstants, FormatConstants, TypeConstants
+from functools import lru_cache
+
+from .const import (
+    FORMATS,
+    REGTYPES,
+    TYPES,
+    DeviceConstants,
+    FormatConstants,
+    TypeConstants,
+)
+from .decoders import get_decoder
 
 
 class StatusItem:
@@ -10,10 +20,7 @@ class StatusItem:
     especially when searching backwards. (At least I don't know how...)
     """
 
-    _number = None
-    _text = None
-    _description = None
-    _translation_key: str = ""
+    __slots__ = ("_number", "_text", "_description", "_translation_key")
 
     def __init__(
         self,
@@ -67,22 +74,69 @@ class StatusItem:
         self._translation_key = val
 
 
+@lru_cache(maxsize=256)
+def unknown_result(val: int) -> str:
+    """Return the text of a number that is not in the result list."""
+    return "unbekannt <" + str(val) + ">"
+
+
+class ResultIndex:
+    """Bidirectional lookups of a result list.
+
+    Built once per result list and shared by all items using the list.
+    If an entry occurs more than once, the first one wins like in the list.
+    """
+
+    def __init__(self, resultlist: list[StatusItem]) -> None:
+        """Construct ResultIndex.
+
+        :param resultlist: the status items
+        :type resultlist: list[StatusItem]
+        """
+        self.by_number: dict[int, StatusItem] = {}
+        self.number_by_text: dict[str, int] = {}
+        self.number_by_translation_key: dict[str, int] = {}
+        for item in resultlist:
+            self.by_number.setdefault(item.number, item)
+            self.number_by_text.setdefault(item.text, item.number)
+            self.number_by_translation_key.setdefault(item.translation_key, item.number)
+
+
+# result indexes by id of the result list, the lists are kept alive here
+_RESULT_INDEXES: dict[int, tuple[list[StatusItem], ResultIndex]] = {}
+
+
+def get_result_index(resultlist: list[StatusItem]) -> ResultIndex:
+    """Return the shared index of a result list.
+
+    :param resultlist: the status items
+    :type resultlist: list[StatusItem]
+    """
+    entry = _RESULT_INDEXES.get(id(resultlist))
+    if entry is None:
+        entry = (resultlist, ResultIndex(resultlist))
+        _RESULT_INDEXES[id(resultlist)] = entry
+    return entry[1]
+
+
 class ApiItem:
     """Class ApiIem item.
 
-    This can either be a ModbusItem or a WebifItem
+    This can either be a ModbusItem or a WebifItem.
+    Params and result lists are shared between items, only the per-item
+    fields are stored in the slots of an item.
     """
 
-    _name = "empty"
-    _format = None
-    _type = TYPES.SENSOR
-    _resultlist = None
-    _device = None
-    _state = None
-    _is_invalid = False
-    _translation_key: str = ""
-    _params = None
-    _divider = 1
+    __slots__ = (
+        "_name",
+        "_format",
+        "_type",
+        "_resultlist",
+        "_device",
+        "_translation_key",
+        "_params",
+        "_divider",
+    )
 
     def __init__(
         self,
@@ -100,8 +154,6 @@ class ApiItem:
         self._type: TypeConstants = mtype
         self._device: DeviceConstants = device
         self._resultlist = resultlist
-        self._state = None
-        self._is_invalid = False
         self._translation_key = translation_key
         self._params = params
         self._divider = 1
@@ -124,25 +176,6 @@ class ApiItem:
     def divider(self, val: dict):
         self._divider = val
 
-    @property
-    def is_invalid(self) -> bool:
-        """Return state."""
-        return self._is_invalid
-
-    @is_invalid.setter
-    def is_invalid(self, val: bool):
-        self._is_invalid = val
-
-    @property
-    def state(self):
-        """Return the state of the item set by modbusobject."""
-        return self._state
-
-    @state.setter
-    def state(self, val):
-        """Set the state of the item from modbus."""
-        self._state = val
-
     @property
     def name(self) -> str:
         """Return name."""
@@ -188,25 +221,29 @@ class ApiItem:
         """Return resultlist."""
         return self._resultlist
 
+    @property
+    def result_index(self) -> ResultIndex | None:
+        """Return the shared index of the result list."""
+        if self._resultlist is None:
+            return None
+        return get_result_index(self._resultlist)
+
     def get_text_from_number(self, val: int) -> str:
         """Get errortext from coresponding number."""
         if val is None:
             return None
         if self._resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
-            if val == item.number:
-                return item.text
-        return "unbekannt <" + str(val) + ">"
+        item = self.result_index.by_number.get(val)
+        if item is None:
+            return unknown_result(val)
+        return item.text
 
     def get_number_from_text(self, val: str) -> int:
         """Get number of coresponding errortext."""
         if self._resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
-            if val == item.text:
-                return item.number
-        return -1
+        return self.result_index.number_by_text.get(val, -1)
 
     def get_translation_key_from_number(self, val: int) -> str:
         """Get errortext from coresponding number."""
@@ -214,10 +251,10 @@ class ApiItem:
             return None
         if self._resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
-            if val == item.number:
-                return item.translation_key
-        return "unbekannt <" + str(val) + ">"
+        item = self.result_index.by_number.get(val)
+        if item is None:
+            return unknown_result(val)
+        return item.translation_key
 
     def get_number_from_translation_key(self, val: str) -> int:
         """Get number of coresponding errortext."""
@@ -225,10 +262,7 @@ class ApiItem:
             return None
         if self._resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
-            if val == item.translation_key:
-                return item.number
-        return -1
+        return self.result_index.number_by_translation_key.get(val, -1)
 
 
 class WebItem(ApiItem):
@@ -237,7 +271,7 @@ class WebItem(ApiItem):
     Used for generating entitys.
     """
 
-    _webif_group = None
+    __slots__ = ("_webif_group",)
 
     def __init__(
         self,
@@ -294,9 +328,13 @@ class WebItem(ApiItem):
 
 
 class ModbusItem(ApiItem):
-    """Represents an Modbus item."""
+    """Represents an Modbus item.
+
+    The items are shared by all config entries. The state of an item per
+    heatpump is kept in the register image of its coordinator.
+    """
 
-    _address = None
+    __slots__ = ("_address", "_register_type", "_decoder", "_item_id")
 
     def __init__(
         self,
@@ -332,6 +370,39 @@ class ModbusItem(ApiItem):
             params=params,
         )
         self._address: str = address
+        # precomputed, so that a poll does not dispatch on type and format
+        self._register_type = self._get_register_type()
+        self._decoder = get_decoder(mformat)
+        # global id of the item, assigned once the catalogue is complete
+        self._item_id: int | None = None
+
+    def clone(self, address: int, name: str, device: DeviceConstants) -> "ModbusItem":
+        """Return a copy of the item for another address and device.
+
+        The copy shares params and result list with the item, e.g. for the
+        items of the heating circuits HZ2..HZ5.
+
+        :param address: Modbus Address of the copy
+        :type address: int
+        :param name: Name of the copy
+        :type name: str
+        :param device: Device the copy belongs to
+        :type device: DeviceConstants"""
+        return ModbusItem(
+            address=address,
+            name=name,
+            mformat=self._format,
+            mtype=self._type,
+            device=device,
+            translation_key=self._translation_key,
+            resultlist=self._resultlist,
+            params=self._params,
+        )
+
+    @property
+    def decoder(self):
+        """Return the decoder of the raw register value."""
+        return self._decoder
 
     @property
     def address(self) -> int:
@@ -342,3 +413,27 @@ class ModbusItem(ApiItem):
     def address(self, val: int):
         """Set address."""
         self._address = val
+
+    @property
+    def register_type(self) -> str:
+        """Return the register type the item is read from."""
+        return self._register_type
+
+    @property
+    def item_id(self) -> int | None:
+        """Return the global id of the item, used as context of its entity."""
+        return self._item_id
+
+    @item_id.setter
+    def item_id(self, val: int):
+        """Set the global id of the item."""
+        self._item_id = val
+
+    def _get_register_type(self) -> str:
+        """Return the register type of the item type."""
+        match self._type:
+            case TYPES.SENSOR | TYPES.SENSOR_CALC:
+                return REGTYPES.INPUT
+            case TYPES.SELECT | TYPES.NUMBER | TYPES.NUMBER_RO:
+                return REGTYPES.HOLDING
+        return None
@@ -6,12 +6,14 @@ It contains a ModbusClient for setting and getting Modbus register values
 
 import asyncio
 import logging
+import random
 
-from pymodbus import ExceptionResponse, ModbusException
+from pymodbus import ModbusException
 from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException
 
 from .configentry import MyConfigEntry
-from .const import FORMATS, TYPES, CONF
+from .const import CONF, CONST, FORMATS, PRIOS, REGTYPES, TYPES
 from .items import ModbusItem
 
 logging.basicConfig()
@@ -22,6 +24,12 @@ class ModbusAPI:
     """
     ModbusAPI class that provides a connection to the modbus,
     which is used by the ModbusItems.
+
+    It owns one long-lived client. When the connection is lost it reconnects
+    in the background with exponential backoff, callers only await a
+    ready connection.
+    All requests are serialized by one priority queue, so writes and user
+    triggered refreshes are served before pending background polls.
     """
 
     def __init__(self, config_entry: MyConfigEntry) -> None:
@@ -33,28 +41,106 @@ class ModbusAPI:
         self._ip = config_entry.data[CONF.HOST]
         self._port = config_entry.data[CONF.PORT]
         self._modbus_client = None
+        self._ready = asyncio.Event()
+        self._reconnect_task: asyncio.Task | None = None
+        self._closing = False
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._queue_task: asyncio.Task | None = None
+        self._sequence = 0
 
-    async def connect(self):
-        """Open modbus connection."""
-        try:
+    @property
+    def connected(self) -> bool:
+        """Return True when the connection is ready for requests."""
+        return self._modbus_client is not None and self._modbus_client.connected
+
+    async def _open(self) -> bool:
+        """Open the connection of the client, create the client once."""
+        if self._modbus_client is None:
+            # reconnects are done by the ModbusAPI, not by the client
             self._modbus_client = AsyncModbusTcpClient(
-                host=self._ip, port=self._port, name="Weishaupt_WBB"
+                host=self._ip, port=self._port, name="Weishaupt_WBB", reconnect_delay=0
             )
-            for _useless in range(3):
-                await self._modbus_client.connect()
-                if self._modbus_client.connected:
-                    return self._modbus_client.connected
-                else:
-                    await asyncio.sleep(1)
-            log.info("Connection to heatpump succeeded")
-
+        try:
+            await self._modbus_client.connect()
         except ModbusException:
             log.warning("Connection to heatpump failed")
-            return None
-        return self._modbus_client.connected
+        if self._modbus_client.connected:
+            self._ready.set()
+            return True
+        self._ready.clear()
+        return False
+
+    async def connect(self):
+        """Open modbus connection.
+
+        An existing connection is kept. When the connection cannot be opened,
+        reconnecting continues in the background."""
+        self._closing = False
+        if self.connected:
+            return True
+        if await self._open():
+            log.info("Connection to heatpump succeeded")
+            return True
+        self._schedule_reconnect()
+        return False
+
+    def _schedule_reconnect(self) -> None:
+        """Start the background reconnect unless it is already running."""
+        if self._closing:
+            return
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        self._reconnect_task = asyncio.get_running_loop().create_task(
+            self._reconnect(), name="weishaupt_modbus reconnect"
+        )
+
+    async def _reconnect(self) -> None:
+        """Reconnect with exponential backoff and jitter."""
+        delay = CONST.RECONNECT_DELAY_MIN
+        while not self._closing and not self.connected:
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            if self._closing:
+                return
+            if await self._open():
+                log.info("Connection to heatpump reestablished")
+                return
+            delay = min(delay * 2, CONST.RECONNECT_DELAY_MAX)
+
+    def connection_lost(self) -> None:
+        """Mark the connection as lost and reconnect in the background."""
+        self._ready.clear()
+        self._schedule_reconnect()
+
+    async def wait_ready(self, timeout: float = CONST.CONNECT_TIMEOUT) -> bool:
+        """Wait until the connection is ready for requests.
+
+        :param timeout: seconds to wait for the connection
+        :type timeout: float"""
+        if self.connected:
+            return True
+        self.connection_lost()
+        try:
+            async with asyncio.timeout(timeout):
+                await self._ready.wait()
+        except TimeoutError:
+            return False
+        return self.connected
 
     def close(self):
         """Close modbus connection."""
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._queue_task is not None:
+            self._queue_task.cancel()
+            self._queue_task = None
+        while not self._queue.empty():
+            _prio, _seq, _request, future = self._queue.get_nowait()
+            future.cancel()
+        self._ready.clear()
+        if self._modbus_client is None:
+            return True
         try:
             self._modbus_client.close()
         except ModbusException:
@@ -67,6 +153,111 @@ class ModbusAPI:
         """Return modbus connection."""
         return self._modbus_client
 
+    async def _run(self, request):
+        """Run a request on the ready connection.
+
+        Returns None when no connection could be established.
+
+        :param request: coroutine function that takes the client
+        :type request: Callable"""
+        if not await self.wait_ready():
+            log.warning("No connection to heatpump")
+            return None
+        try:
+            return await request(self._modbus_client)
+        except ConnectionException:
+            self.connection_lost()
+            raise
+
+    async def _serve_queue(self) -> None:
+        """Run the queued requests one after the other by priority."""
+        while True:
+            _prio, _seq, request, future = await self._queue.get()
+            if future.done():
+                # the caller is not waiting anymore
+                continue
+            try:
+                result = await self._run(request)
+            except Exception as exc:  # noqa: BLE001
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def _execute(self, request, priority: int = PRIOS.POLL):
+        """Queue a request and wait for its result.
+
+        :param request: coroutine function that takes the client
+        :type request: Callable
+        :param priority: one of PRIOS, lower values are served first
+        :type priority: int"""
+        if self._closing:
+            # no worker is started for a closed connection
+            raise ConnectionException("Connection to heatpump is closed")
+        if self._queue_task is None or self._queue_task.done():
+            self._queue_task = asyncio.get_running_loop().create_task(
+                self._serve_queue(), name="weishaupt_modbus requests"
+            )
+        future = asyncio.get_running_loop().create_future()
+        # the sequence keeps the order of requests with the same priority
+        self._sequence += 1
+        self._queue.put_nowait((priority, self._sequence, request, future))
+        return await future
+
+    async def read_registers(
+        self,
+        register_type: str,
+        address: int,
+        count: int,
+        priority: int = PRIOS.POLL,
+    ):
+        """Read a block of registers.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param address: address of the first register
+        :type address: int
+        :param count: number of registers to read
+        :type count: int
+        :param priority: one of PRIOS
+        :type priority: int"""
+        if register_type == REGTYPES.INPUT:
+            return await self._execute(
+                lambda client: client.read_input_registers(
+                    address, count=count, slave=1
+                ),
+                priority,
+            )
+        return await self._execute(
+            lambda client: client.read_holding_registers(address, count=count, slave=1),
+            priority,
+        )
+
+    async def write_register(self, address: int, value: int):
+        """Write a single holding register.
+
+        :param address: address of the register
+        :type address: int
+        :param value: raw value to write
+        :type value: int"""
+        return await self._execute(
+            lambda client: client.write_register(address, value, slave=1),
+            PRIOS.WRITE,
+        )
+
+    async def write_registers(self, address: int, values: list[int]):
+        """Write contiguous holding registers with a single request.
+
+        :param address: address of the first register
+        :type address: int
+        :param values: raw values to write
+        :type values: list[int]"""
+        return await self._execute(
+            lambda client: client.write_registers(address, values, slave=1),
+            PRIOS.WRITE,
+        )
+
 
 class ModbusObject:
     """ModbusObject.
@@ -84,64 +275,7 @@ class ModbusObject:
         :type modbus_item: ModbusItem
         """
         self._modbus_item = modbus_item
-        self._modbus_client = modbus_api.get_device()
-
-    def check_valid_result(self, val) -> int:
-        """Check if item is available and valid."""
-        match self._modbus_item.format:
-            case FORMATS.TEMPERATUR:
-                return self.check_temperature(val)
-            case FORMATS.PERCENTAGE:
-                return self.check_percentage(val)
-            case FORMATS.STATUS:
-                return self.check_status(val)
-            case _:
-                self._modbus_item.is_invalid = False
-                return val
-
-    def check_temperature(self, val) -> int:
-        """Check availability of temperature item and translate
-        return value to valid int
-
-        :param val: The value from the modbus
-        :type val: int"""
-        match val:
-            case -32768:
-                # No Sensor installed, remove it from the list
-                self._modbus_item.is_invalid = True
-                return None
-            case 32768:
-                # This seems to be zero, should be allowed
-                self._modbus_item.is_invalid = True
-                return None
-            case -32767:
-                # Sensor broken set return value to -99.9 to inform user
-                self._modbus_item.is_invalid = False
-                return -999
-            case _:
-                # Temperature Sensor seems to be Einerkomplement
-                if val > 32768:
-                    val = val - 65536
-                self._modbus_item.is_invalid = False
-                return val
-
-    def check_percentage(self, val) -> int:
-        """Check availability of percentage item and translate
-        return value to valid int
-
-        :param val: The value from the modbus
-        :type val: int"""
-        if val == 65535:
-            self._modbus_item.is_invalid = True
-            return None
-        else:
-            self._modbus_item.is_invalid = False
-            return val
-
-    def check_status(self, val) -> int:
-        """Check general availability of item."""
-        self._modbus_item.is_invalid = False
-        return val
+        self._modbus_api = modbus_api
 
     def check_valid_response(self, val) -> int:
         """Check if item is valid to write."""
@@ -153,90 +287,34 @@ class ModbusObject:
             case _:
                 return val
 
-    def validate_modbus_answer(self, mbr) -> int:
-        """Check if there's a valid answer from modbus and
-        translate it to a valid int depending from type
-
-        :param mbr: The modbus response
-        :type mbr: modbus response"""
-        val = None
-        if mbr.isError():
-            myexception_code: ExceptionResponse = mbr
-            if myexception_code.exception_code == 2:
-                self._modbus_item.is_invalid = True
-            else:
-                log.warning(
-                    "Received Modbus library error: %s in item: %s",
-                    str(mbr),
-                    str(self._modbus_item.name),
-                )
-            return None
-        if isinstance(mbr, ExceptionResponse):
-            log.warning(
-                "Received ModbusException: %s from library in item: %s",
-                str(mbr),
-                str(self._modbus_item.name),
-            )
-            return None
-            # THIS IS NOT A PYTHON EXCEPTION, but a valid modbus message
-        if len(mbr.registers) > 0:
-            val = self.check_valid_result(mbr.registers[0])
-            return val
-
-    @property
-    async def value(self):
-        """Returns the value from the modbus register."""
-        if self._modbus_client is None:
-            return None
-
-        if not self._modbus_item.is_invalid:
-            try:
-                match self._modbus_item.type:
-                    case TYPES.SENSOR | TYPES.SENSOR_CALC:
-                        # Sensor entities are read-only
-                        mbr = await self._modbus_client.read_input_registers(
-                            self._modbus_item.address, slave=1
-                        )
-                        return self.validate_modbus_answer(mbr)
-                    case TYPES.SELECT | TYPES.NUMBER | TYPES.NUMBER_RO:
-                        mbr = await self._modbus_client.read_holding_registers(
-                            self._modbus_item.address, slave=1
-                        )
-                        return self.validate_modbus_answer(mbr)
-                    case _:
-                        log.warning(
-                            "Unknown Sensor type: %s in %s",
-                            str(self._modbus_item.type),
-                            str(self._modbus_item.name),
-                        )
-                        return None
-            except ModbusException as exc:
-                log.warning(
-                    "ModbusException: Reading %s in item: %s failed",
-                    str(exc),
-                    str(self._modbus_item.name),
-                )
-                return None
-
-    # @value.setter
-    async def setvalue(self, value) -> None:
+    async def setvalue(self, value) -> bool:
         """Set the value of the modbus register, does nothing when not R/W.
 
+        Returns True when the value has been written.
+
         :param val: The value to write to the modbus
         :type val: int"""
-        if self._modbus_client is None:
-            return
         try:
             match self._modbus_item.type:
                 case TYPES.SENSOR | TYPES.NUMBER_RO | TYPES.SENSOR_CALC:
                     # Sensor entities are read-only
-                    return
+                    return False
                 case _:
-                    await self._modbus_client.write_register(
+                    mbr = await self._modbus_api.write_register(
                         self._modbus_item.address,
                         self.check_valid_response(value),
-                        slave=1,
                     )
+                    if mbr is None:
+                        return False
+                    if mbr.isError():
+                        log.warning(
+                            "Received Modbus library error: %s writing %s to %s",
+                            str(mbr),
+                            str(value),
+                            str(self._modbus_item.name),
+                        )
+                        return False
+                    return True
         except ModbusException:
             log.warning(
                 "ModbusException: Writing %s to %s (%s) failed",
@@ -244,4 +322,4 @@ class ModbusObject:
                 str(self._modbus_item.name),
                 str(self._modbus_item.address),
             )
-            return
+            return False
@@ -0,0 +1,345 @@
+"""Read planner.
+
+Groups ModbusItems into blocks of registers, so that a poll cycle
+needs one modbus request per block instead of one request per item.
+Blocks may span small gaps of unused registers. Addresses inside a gap that
+answer with an illegal address exception are kept in the negative cache of
+the host and the following plans are built around them until they expire.
+Writes of several holding registers are grouped the same way, without gaps.
+"""
+
+import logging
+
+from pymodbus import ExceptionResponse, ModbusException
+
+from .const import CONST, PRIOS, READRESULTS, REASONS, REGSTATUS
+from .items import ModbusItem
+from .modbusobject import ModbusAPI
+from .negativecache import NegativeCache, get_negative_cache
+from .registerimage import RegisterImage
+
+logging.basicConfig()
+log = logging.getLogger(__name__)
+
+
+def plan_writes(
+    values: dict[int, int], max_block_size: int = CONST.MAX_WRITE_BLOCK_SIZE
+) -> list[tuple[int, list[int]]]:
+    """Group raw holding register values into runs of contiguous addresses.
+
+    Returns (first address, values) per write request.
+
+    :param values: raw values keyed by address
+    :type values: dict[int, int]
+    :param max_block_size: maximum number of registers per request
+    :type max_block_size: int
+    """
+    batches: list[tuple[int, list[int]]] = []
+    for address in sorted(values):
+        if (
+            len(batches) > 0
+            and address == batches[-1][0] + len(batches[-1][1])
+            and len(batches[-1][1]) < max_block_size
+        ):
+            batches[-1][1].append(values[address])
+        else:
+            batches.append((address, [values[address]]))
+    return batches
+
+
+class ReadSet:
+    """The registers of a poll, each bound to all modbus items reading it.
+
+    Several items can share one register (e.g. an energy counter and the
+    work coefficient calculated from it). The register is read once into the
+    register image and every item bound to it decodes its value from there.
+    """
+
+    def __init__(self, modbus_items: list[ModbusItem], image: RegisterImage) -> None:
+        """Construct ReadSet.
+
+        :param modbus_items: items to be read
+        :type modbus_items: list[ModbusItem]
+        :param image: the register image the registers are read into
+        :type image: RegisterImage
+        """
+        self._registers: dict[tuple[str, int], list[ModbusItem]] = {}
+        self._image = image
+        for item in modbus_items:
+            self._registers.setdefault((item.register_type, item.address), []).append(
+                item
+            )
+
+    @property
+    def registers(self) -> dict[tuple[str, int], list[ModbusItem]]:
+        """Return the items keyed by (register type, address)."""
+        return self._registers
+
+    @property
+    def image(self) -> RegisterImage:
+        """Return the register image the registers are read into."""
+        return self._image
+
+    def items_at(self, register_type: str, address: int) -> list[ModbusItem]:
+        """Return the items bound to a register."""
+        return self._registers.get((register_type, address), [])
+
+    def __len__(self) -> int:
+        """Return number of registers."""
+        return len(self._registers)
+
+
+class ReadBlock:
+    """A range of registers that is read with a single request."""
+
+    def __init__(
+        self, register_type: str, addresses: list[int], read_set: ReadSet
+    ) -> None:
+        """Construct ReadBlock.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param addresses: addresses of the registers in use, sorted
+        :type addresses: list[int]
+        :param read_set: the read set the addresses belong to
+        :type read_set: ReadSet
+        """
+        self._register_type = register_type
+        self._addresses = addresses
+        self._read_set = read_set
+        self._address = addresses[0]
+        self._count = addresses[-1] - self._address + 1
+
+    @property
+    def register_type(self) -> str:
+        """Return register type."""
+        return self._register_type
+
+    @property
+    def address(self) -> int:
+        """Return address of the first register."""
+        return self._address
+
+    @property
+    def count(self) -> int:
+        """Return number of registers."""
+        return self._count
+
+    @property
+    def addresses(self) -> list[int]:
+        """Return the addresses of the registers in use."""
+        return self._addresses
+
+    @property
+    def image(self) -> RegisterImage:
+        """Return the register image the block is read into."""
+        return self._read_set.image
+
+    @property
+    def items(self) -> list[ModbusItem]:
+        """Return the items covered by the block."""
+        items = []
+        for address in self._addresses:
+            items.extend(self._read_set.items_at(self._register_type, address))
+        return items
+
+    def items_at(self, address: int) -> list[ModbusItem]:
+        """Return the items bound to an address of the block."""
+        return self._read_set.items_at(self._register_type, address)
+
+    def split(self):
+        """Split the block into two blocks with half of the addresses each."""
+        middle = len(self._addresses) // 2
+        return (
+            ReadBlock(self._register_type, self._addresses[:middle], self._read_set),
+            ReadBlock(self._register_type, self._addresses[middle:], self._read_set),
+        )
+
+    async def read(self, modbus_api: ModbusAPI, priority: int = PRIOS.POLL) -> str:
+        """Read the block into the register image.
+
+        Returns one of READRESULTS.
+
+        :param modbus_api: The modbus API
+        :type modbus_api: ModbusAPI
+        :param priority: one of PRIOS
+        :type priority: int"""
+        try:
+            mbr = await modbus_api.read_registers(
+                self._register_type, self._address, self._count, priority
+            )
+        except ModbusException as exc:
+            log.warning(
+                "ModbusException: Reading %s registers from %s failed: %s",
+                str(self._count),
+                str(self._address),
+                str(exc),
+            )
+            return READRESULTS.FAILED
+        if mbr is None:
+            return READRESULTS.FAILED
+        if mbr.isError() or isinstance(mbr, ExceptionResponse):
+            if getattr(mbr, "exception_code", None) == 2:
+                return READRESULTS.ILLEGAL_ADDRESS
+            log.warning(
+                "Received Modbus library error: %s reading %s registers from %s",
+                str(mbr),
+                str(self._count),
+                str(self._address),
+            )
+            return READRESULTS.FAILED
+        if len(mbr.registers) < self._count:
+            return READRESULTS.FAILED
+
+        # the items decode their values lazily from the published image
+        self._read_set.image.write(
+            self._register_type, self._address, mbr.registers[: self._count]
+        )
+        return READRESULTS.OK
+
+
+class ReadPlanner:
+    """Builds and executes the block reads for a set of modbus items."""
+
+    def __init__(
+        self,
+        host: str,
+        max_gap: int = CONST.MAX_READ_GAP,
+        max_block_size: int = CONST.MAX_BLOCK_SIZE,
+    ) -> None:
+        """Construct ReadPlanner.
+
+        :param host: host of the heatpump, invalid registers are learned per host
+        :type host: str
+        :param max_gap: number of unused registers a block may span
+        :type max_gap: int
+        :param max_block_size: maximum number of registers per request
+        :type max_block_size: int
+        """
+        self._max_gap = max_gap
+        self._max_block_size = max_block_size
+        self._negative_cache = get_negative_cache(host)
+
+    @property
+    def negative_cache(self) -> NegativeCache:
+        """Return the negative cache of invalid registers."""
+        return self._negative_cache
+
+    def is_invalid(self, modbus_item: ModbusItem) -> bool:
+        """Check if the register of an item is invalid and not due for a probe.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem
+        """
+        return self._negative_cache.is_invalid(
+            (modbus_item.register_type, modbus_item.address)
+        )
+
+    def _gap_is_legal(self, register_type: str, first: int, last: int) -> bool:
+        """Check that no learned illegal address lies between first and last."""
+        for address in range(first + 1, last):
+            if self._negative_cache.is_invalid(
+                (register_type, address), REASONS.ILLEGAL_ADDRESS
+            ):
+                return False
+        return True
+
+    def _update_negative_cache(self, block: ReadBlock) -> None:
+        """Learn the registers of a block read with sensor values as valid or not.
+
+        A register is invalid when all of its items are invalid."""
+        for address in block.addresses:
+            key = (block.register_type, address)
+            items = block.items_at(address)
+            if len(items) > 0 and all(block.image.is_invalid(item) for item in items):
+                self._negative_cache.add(key, REASONS.NO_SENSOR)
+            else:
+                self._negative_cache.remove(key)
+
+    def plan(self, read_set: ReadSet) -> list[ReadBlock]:
+        """Group the registers of a read set by register type and address into blocks.
+
+        :param read_set: registers to be read
+        :type read_set: ReadSet
+        """
+        blocks: list[ReadBlock] = []
+        register_type = None
+        addresses: list[int] = []
+
+        for key in sorted(read_set.registers):
+            if self._negative_cache.is_invalid(key):
+                read_set.image.mark(key[0], key[1], REGSTATUS.INVALID)
+                continue
+            if len(addresses) > 0 and (
+                key[0] != register_type
+                or key[1] > addresses[-1] + self._max_gap + 1
+                or key[1] - addresses[0] >= self._max_block_size
+                or not self._gap_is_legal(key[0], addresses[-1], key[1])
+            ):
+                blocks.append(ReadBlock(register_type, addresses, read_set))
+                addresses = []
+            register_type = key[0]
+            addresses.append(key[1])
+
+        if len(addresses) > 0:
+            blocks.append(ReadBlock(register_type, addresses, read_set))
+
+        return blocks
+
+    async def read(
+        self, modbus_api: ModbusAPI, block: ReadBlock, priority: int = PRIOS.POLL
+    ) -> list[ModbusItem]:
+        """Read a block, bisect it when it contains illegal addresses.
+
+        Returns the items that could not be read, e.g. due to a lost
+        connection. Items of learned illegal addresses have been read.
+
+        :param modbus_api: The modbus API
+        :type modbus_api: ModbusAPI
+        :param block: the block to read
+        :type block: ReadBlock
+        :param priority: one of PRIOS
+        :type priority: int"""
+        _complete, failed = await self._read(modbus_api, block, priority)
+        return failed
+
+    async def _read(
+        self, modbus_api: ModbusAPI, block: ReadBlock, priority: int
+    ) -> tuple[bool, list[ModbusItem]]:
+        """Read a block, bisect it when it contains illegal addresses.
+
+        Returns if all registers of the block have been read and the items
+        that could not be read."""
+        match await block.read(modbus_api, priority):
+            case READRESULTS.OK:
+                self._update_negative_cache(block)
+                return True, []
+            case READRESULTS.FAILED:
+                for address in block.addresses:
+                    block.image.forget(block.register_type, address)
+                return False, block.items
+
+        if block.count == 1:
+            # the register itself is illegal
+            self._negative_cache.add(
+                (block.register_type, block.address), REASONS.ILLEGAL_ADDRESS
+            )
+            block.image.mark(block.register_type, block.address, REGSTATUS.INVALID)
+            return False, []
+
+        left, right = block.split()
+        left_ok, left_failed = await self._read(modbus_api, left, priority)
+        right_ok, right_failed = await self._read(modbus_api, right, priority)
+        gap_start = left.address + left.count
+        if left_ok and right_ok and gap_start < right.address:
+            # both halves can be read, so the gap between them is illegal
+            for address in range(gap_start, right.address):
+                self._negative_cache.add(
+                    (block.register_type, address), REASONS.ILLEGAL_ADDRESS
+                )
+            log.info(
+                "Illegal registers %s..%s learned, not merged until re-probed",
+                str(gap_start),
+                str(right.address - 1),
+            )
+        return False, left_failed + right_failed
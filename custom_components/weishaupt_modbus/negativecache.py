@@ -0,0 +1,108 @@
+"""Negative cache of invalid registers.
+
+Registers that are invalid, e.g. because the heatpump does not know the
+address or no sensor is connected, are not read for some time. After that
+time they are probed again, the delay doubles with every failed probe up to
+a maximum depending on the reason. Registers that are really absent cost
+almost nothing and transient ones come back automatically.
+"""
+
+import time
+
+from .const import CONST
+
+# negative caches per host, kept over reloads of the config entry
+_NEGATIVE_CACHES: dict[str, "NegativeCache"] = {}
+
+
+def get_negative_cache(host: str) -> "NegativeCache":
+    """Return the negative cache of a host.
+
+    :param host: host of the heatpump
+    :type host: str
+    """
+    return _NEGATIVE_CACHES.setdefault(host, NegativeCache())
+
+
+class NegativeCache:
+    """Invalid registers with their reason and the time of the next probe."""
+
+    def __init__(self) -> None:
+        """Construct NegativeCache."""
+        # (register type, address): (reason, failed probes, time of next probe)
+        self._entries: dict[tuple[str, int], tuple[str, int, float]] = {}
+
+    def add(self, key: tuple[str, int], reason: str, now: float = None) -> None:
+        """Mark a register invalid, or extend the delay when it still is.
+
+        :param key: register type and address
+        :type key: tuple[str, int]
+        :param reason: one of REASONS
+        :type reason: str
+        :param now: monotonic time, defaults to the current time
+        :type now: float
+        """
+        if now is None:
+            now = time.monotonic()
+        failures = 1
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == reason:
+            failures = entry[1] + 1
+        first, maximum = CONST.REPROBE_DELAYS[reason]
+        delay = min(first * 2 ** (failures - 1), maximum)
+        self._entries[key] = (reason, failures, now + delay)
+
+    def restore(self, key: tuple[str, int], reason: str, now: float = None) -> None:
+        """Mark a stored register invalid, unless it is known already.
+
+        Unlike add, a register that is invalid already keeps its delay, so
+        restoring on every reload does not escalate it.
+
+        :param key: register type and address
+        :type key: tuple[str, int]
+        :param reason: one of REASONS
+        :type reason: str
+        :param now: monotonic time, defaults to the current time
+        :type now: float
+        """
+        if key not in self._entries:
+            self.add(key, reason, now)
+
+    def remove(self, key: tuple[str, int]) -> None:
+        """Mark a register valid again.
+
+        :param key: register type and address
+        :type key: tuple[str, int]
+        """
+        self._entries.pop(key, None)
+
+    def is_invalid(
+        self, key: tuple[str, int], reason: str = None, now: float = None
+    ) -> bool:
+        """Check if a register is invalid and not due for a probe.
+
+        :param key: register type and address
+        :type key: tuple[str, int]
+        :param reason: only check for this reason, one of REASONS
+        :type reason: str
+        :param now: monotonic time, defaults to the current time
+        :type now: float
+        """
+        entry = self._entries.get(key)
+        if entry is None or (reason is not None and entry[0] != reason):
+            return False
+        if now is None:
+            now = time.monotonic()
+        return now < entry[2]
+
+    def keys(self, reason: str) -> list[tuple[str, int]]:
+        """Return the registers that are invalid for a reason.
+
+        :param reason: one of REASONS
+        :type reason: str
+        """
+        return [key for key, entry in self._entries.items() if entry[0] == reason]
+
+    def __len__(self) -> int:
+        """Return number of invalid registers."""
+        return len(self._entries)
@@ -0,0 +1,110 @@
+"""Persisted probe results.
+
+The availability of the items and the illegal addresses of a heatpump
+hardly ever change, the installed sensors and circuits stay the same. The
+results of the availability probe are stored per host, together with a
+fingerprint of the item catalogue and of the configuration registers of the
+heatpump. A restart creates the entities from the stored results when the
+fingerprint still matches and revalidates them in the background.
+"""
+
+import hashlib
+import json
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import CONST
+from .items import ModbusItem
+from .registerimage import RegisterSnapshot
+
+
+def create_fingerprint(
+    modbus_items: list[ModbusItem],
+    config_items: list[ModbusItem],
+    snapshot: RegisterSnapshot,
+) -> str:
+    """Return a fingerprint of the item catalogue and the heatpump configuration.
+
+    :param modbus_items: the probed items
+    :type modbus_items: list[ModbusItem]
+    :param config_items: items of the configuration registers
+    :type config_items: list[ModbusItem]
+    :param snapshot: snapshot holding the configuration registers
+    :type snapshot: RegisterSnapshot
+    """
+    catalogue = [
+        (item.item_id, item.register_type, item.address, item.format)
+        for item in modbus_items
+    ]
+    configuration = [
+        (item.address, snapshot.raw(item.register_type, item.address))
+        for item in config_items
+    ]
+    data = json.dumps([catalogue, configuration]).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+class ProbeCache:
+    """Probe results of a heatpump, stored with the HA storage helper."""
+
+    def __init__(self, hass: HomeAssistant, host: str) -> None:
+        """Construct ProbeCache.
+
+        :param hass: HomeAssistant
+        :type hass: HomeAssistant
+        :param host: host of the heatpump
+        :type host: str
+        """
+        self._store = Store(
+            hass,
+            CONST.PROBE_CACHE_VERSION,
+            f"{CONST.DOMAIN}.probe_{slugify(host)}",
+        )
+
+    async def async_load(
+        self, fingerprint: str
+    ) -> tuple[dict[int, bool], list[tuple[str, int]]] | None:
+        """Return the stored availability and illegal addresses.
+
+        Returns None when nothing is stored for the fingerprint.
+
+        :param fingerprint: fingerprint of catalogue and configuration
+        :type fingerprint: str
+        """
+        data = await self._store.async_load()
+        if data is None or data.get("fingerprint") != fingerprint:
+            return None
+        # the keys of JSON objects are strings
+        availability = {
+            int(item_id): available
+            for item_id, available in data["availability"].items()
+        }
+        illegal = [
+            (register_type, address) for register_type, address in data["illegal"]
+        ]
+        return availability, illegal
+
+    async def async_save(
+        self,
+        fingerprint: str,
+        availability: dict[int, bool],
+        illegal: list[tuple[str, int]],
+    ) -> None:
+        """Store the availability and illegal addresses.
+
+        :param fingerprint: fingerprint of catalogue and configuration
+        :type fingerprint: str
+        :param availability: availability by item id
+        :type availability: dict[int, bool]
+        :param illegal: register type and address of the illegal addresses
+        :type illegal: list[tuple[str, int]]
+        """
+        await self._store.async_save(
+            {
+                "fingerprint": fingerprint,
+                "availability": availability,
+                "illegal": [list(key) for key in illegal],
+            }
+        )
@@ -0,0 +1,274 @@
+"""Register image.
+
+The coordinator keeps the raw registers of the heatpump in one array per
+register type, indexed by the offset of the address. A poll writes whole
+blocks into the image and publishes an immutable snapshot when it is done.
+The modbus items are shared by all config entries and hold no state, the
+entities decode the state of their item lazily from the snapshot of their
+coordinator. They therefore read consistent values of one poll and two
+snapshots can be compared cheaply.
+"""
+
+from array import array
+
+import numpy as np
+
+from .const import REGSTATUS
+from .items import ModbusItem
+
+
+class RegisterSnapshot:
+    """Immutable copy of the register image after a poll."""
+
+    def __init__(
+        self,
+        bases: dict[str, int],
+        words: dict[str, bytes],
+        status: dict[str, bytes],
+    ) -> None:
+        """Construct RegisterSnapshot.
+
+        :param bases: first address per register type
+        :type bases: dict[str, int]
+        :param words: raw registers per register type, as unsigned 16 bit words
+        :type words: dict[str, bytes]
+        :param status: status of every register per register type
+        :type status: dict[str, bytes]
+        """
+        self._bases = bases
+        self._data = words
+        self._words = {
+            register_type: memoryview(data).cast("H")
+            for register_type, data in words.items()
+        }
+        self._status = status
+
+    def __eq__(self, other: object) -> bool:
+        """Check if two snapshots hold the same registers with the same status.
+
+        The coordinator does not notify its listeners for equal snapshots."""
+        if not isinstance(other, RegisterSnapshot):
+            return NotImplemented
+        return (
+            self._bases == other._bases
+            and self._data == other._data
+            and self._status == other._status
+        )
+
+    __hash__ = None
+
+    def _offset(self, register_type: str, address: int) -> int | None:
+        """Return the offset of an address, None if it is not in the image."""
+        base = self._bases.get(register_type)
+        if base is None:
+            return None
+        if not 0 <= address - base < len(self._status[register_type]):
+            return None
+        return address - base
+
+    def raw(self, register_type: str, address: int) -> int | None:
+        """Return a raw register, None if it has not been read.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param address: address of the register
+        :type address: int"""
+        offset = self._offset(register_type, address)
+        if offset is None:
+            return None
+        if self._status[register_type][offset] != REGSTATUS.VALID:
+            return None
+        return self._words[register_type][offset]
+
+    def state(self, modbus_item: ModbusItem):
+        """Return the decoded state of an item.
+
+        Only the register of the item is decoded, the image spans far more
+        addresses than there are items.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem"""
+        raw = self.raw(modbus_item.register_type, modbus_item.address)
+        if raw is None:
+            return None
+        return modbus_item.decoder(raw)
+
+    def changed(self, previous: "RegisterSnapshot") -> set[tuple[str, int]]:
+        """Return the registers that differ from a previous snapshot.
+
+        :param previous: the snapshot to compare with
+        :type previous: RegisterSnapshot"""
+        changed = set()
+        for register_type, base in self._bases.items():
+            words, status = self.arrays(register_type)
+            if previous.arrays(register_type) is None:
+                offsets = np.flatnonzero(status)
+            else:
+                previous_words, previous_status = previous.arrays(register_type)
+                offsets = np.flatnonzero(
+                    (words != previous_words) | (status != previous_status)
+                )
+            changed.update((register_type, base + int(offset)) for offset in offsets)
+        return changed
+
+    def arrays(self, register_type: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Return read-only arrays of the registers and their status.
+
+        :param register_type: input or holding registers
+        :type register_type: str"""
+        if register_type not in self._bases:
+            return None
+        return (
+            np.frombuffer(self._words[register_type], dtype=np.uint16),
+            np.frombuffer(self._status[register_type], dtype=np.uint8),
+        )
+
+
+class RegisterImage:
+    """Raw registers of the heatpump, one array per register type."""
+
+    def __init__(self, modbus_items: list[ModbusItem]) -> None:
+        """Construct RegisterImage covering the addresses of the items.
+
+        :param modbus_items: items that are read into the image
+        :type modbus_items: list[ModbusItem]
+        """
+        ranges: dict[str, tuple[int, int]] = {}
+        for item in modbus_items:
+            if item.register_type is None:
+                continue
+            first, last = ranges.get(item.register_type, (item.address, item.address))
+            ranges[item.register_type] = (
+                min(first, item.address),
+                max(last, item.address),
+            )
+        self._bases = {
+            register_type: first for register_type, (first, _last) in ranges.items()
+        }
+        self._words = {
+            register_type: array("H", bytes(2 * (last - first + 1)))
+            for register_type, (first, last) in ranges.items()
+        }
+        self._status = {
+            register_type: bytearray(last - first + 1)
+            for register_type, (first, last) in ranges.items()
+        }
+        self._snapshot = self.publish()
+
+    def _offset(self, register_type: str, address: int) -> int | None:
+        """Return the offset of an address, None if it is not in the image."""
+        base = self._bases.get(register_type)
+        if base is None:
+            return None
+        if not 0 <= address - base < len(self._status[register_type]):
+            return None
+        return address - base
+
+    def is_invalid(self, modbus_item: ModbusItem) -> bool:
+        """Check if an item is invalid, e.g. illegal address or no sensor.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem"""
+        match self.status(modbus_item.register_type, modbus_item.address):
+            case REGSTATUS.VALID:
+                raw = self.raw(modbus_item.register_type, modbus_item.address)
+                return modbus_item.decoder(raw) is None
+            case REGSTATUS.INVALID:
+                return True
+        return False
+
+    def forget(self, register_type: str, address: int) -> None:
+        """Drop the value of a register after a failed read.
+
+        Registers marked invalid keep their status.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param address: address of the register
+        :type address: int"""
+        if self.status(register_type, address) == REGSTATUS.VALID:
+            self.mark(register_type, address, REGSTATUS.UNREAD)
+
+    def write(self, register_type: str, address: int, registers: list[int]) -> None:
+        """Store raw registers, registers outside of the image are dropped.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param address: address of the first register
+        :type address: int
+        :param registers: raw registers
+        :type registers: list[int]"""
+        base = self._bases.get(register_type)
+        if base is None:
+            return
+        size = len(self._status[register_type])
+        first = max(address - base, 0)
+        last = min(address - base + len(registers), size)
+        if first >= last:
+            return
+        skip = first - (address - base)
+        self._words[register_type][first:last] = array(
+            "H", registers[skip : skip + last - first]
+        )
+        self._status[register_type][first:last] = bytes([REGSTATUS.VALID]) * (
+            last - first
+        )
+
+    def mark(self, register_type: str, address: int, status: int) -> None:
+        """Set the status of a register, e.g. invalid for illegal addresses.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param address: address of the register
+        :type address: int
+        :param status: one of REGSTATUS
+        :type status: int"""
+        offset = self._offset(register_type, address)
+        if offset is not None:
+            self._status[register_type][offset] = status
+
+    def status(self, register_type: str, address: int) -> int:
+        """Return the status of a register.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param address: address of the register
+        :type address: int"""
+        offset = self._offset(register_type, address)
+        if offset is None:
+            return REGSTATUS.UNREAD
+        return self._status[register_type][offset]
+
+    def raw(self, register_type: str, address: int) -> int | None:
+        """Return a raw register of the image, None if it has not been read.
+
+        :param register_type: input or holding registers
+        :type register_type: str
+        :param address: address of the register
+        :type address: int"""
+        offset = self._offset(register_type, address)
+        if offset is None:
+            return None
+        if self._status[register_type][offset] != REGSTATUS.VALID:
+            return None
+        return self._words[register_type][offset]
+
+    def publish(self) -> RegisterSnapshot:
+        """Publish an immutable snapshot of the image."""
+        self._snapshot = RegisterSnapshot(
+            dict(self._bases),
+            {
+                register_type: words.tobytes()
+                for register_type, words in self._words.items()
+            },
+            {
+                register_type: bytes(status)
+                for register_type, status in self._status.items()
+            },
+        )
+        return self._snapshot
+
+    @property
+    def snapshot(self) -> RegisterSnapshot:
+        """Return the last published snapshot."""
+        return self._snapshot
@@ -0,0 +1,143 @@
+"""Poll scheduler.
+
+Every modbus item has its own scan interval. The coordinator ticks with a
+short interval and the scheduler hands out only the items that are due.
+In adaptive mode the interval of an item is stretched while its value does
+not change and falls back to its configured interval as soon as it does, so
+items are never polled more often than configured.
+"""
+
+import time
+
+from .const import CONST, REGTYPES
+from .hpconst import DEVICE_SCAN_INTERVALS, DEVICE_SCAN_MAX_INTERVALS
+from .items import ModbusItem
+
+
+def get_scan_interval(modbus_item: ModbusItem) -> int:
+    """Return the scan interval of an item in seconds.
+
+    :param modbus_item: definition of modbus item
+    :type modbus_item: ModbusItem
+    """
+    default = DEVICE_SCAN_INTERVALS.get(
+        modbus_item.device, CONST.SCAN_INTERVAL.total_seconds()
+    )
+    if modbus_item.params is not None:
+        interval = modbus_item.params.get("scan_interval", default)
+    else:
+        interval = default
+    if modbus_item.register_type == REGTYPES.HOLDING:
+        # holding registers are served from the write-through cache
+        return max(interval, CONST.HOLDING_SCAN_INTERVAL.total_seconds())
+    return interval
+
+
+def get_max_scan_interval(modbus_item: ModbusItem) -> int:
+    """Return the upper bound of the adaptive scan interval of an item.
+
+    The bound is never below the configured scan interval of the item.
+
+    :param modbus_item: definition of modbus item
+    :type modbus_item: ModbusItem
+    """
+    interval = get_scan_interval(modbus_item)
+    return max(DEVICE_SCAN_MAX_INTERVALS.get(modbus_item.device, interval), interval)
+
+
+class PollScheduler:
+    """Keeps track of the next poll time of every modbus item."""
+
+    def __init__(
+        self,
+        adaptive: bool = CONST.ADAPTIVE_POLLING,
+        steady_cycles: int = CONST.ADAPTIVE_STEADY_CYCLES,
+    ) -> None:
+        """Construct PollScheduler.
+
+        :param adaptive: adapt the scan intervals to the rate of change
+        :type adaptive: bool
+        :param steady_cycles: number of unchanged polls before the interval is doubled
+        :type steady_cycles: int
+        """
+        self._adaptive = adaptive
+        self._steady_cycles = steady_cycles
+        self._next_poll: dict[ModbusItem, float] = {}
+        self._interval: dict[ModbusItem, float] = {}
+        self._unchanged: dict[ModbusItem, int] = {}
+
+    def due_items(self, modbus_items: list[ModbusItem], now: float = None) -> list:
+        """Return the items that have to be polled now.
+
+        Items that have never been polled are always due.
+
+        :param modbus_items: items to choose from
+        :type modbus_items: list[ModbusItem]
+        :param now: monotonic time, defaults to the current time
+        :type now: float
+        """
+        if now is None:
+            now = time.monotonic()
+        return [
+            item for item in modbus_items if self._next_poll.get(item, now) <= now
+        ]
+
+    def get_interval(self, modbus_item: ModbusItem) -> float:
+        """Return the current scan interval of an item in seconds."""
+        return self._interval.get(modbus_item, get_scan_interval(modbus_item))
+
+    def _adapt(self, modbus_item: ModbusItem, state, previous_state) -> float:
+        """Return the next scan interval depending on the change of the state."""
+        interval = self.get_interval(modbus_item)
+        if state is None:
+            # failed reads say nothing about the rate of change
+            return interval
+        if modbus_item.register_type == REGTYPES.HOLDING:
+            # holding registers are kept up to date by writes
+            return interval
+
+        if state != previous_state:
+            self._unchanged[modbus_item] = 0
+            return get_scan_interval(modbus_item)
+
+        unchanged = self._unchanged.get(modbus_item, 0) + 1
+        if unchanged >= self._steady_cycles:
+            unchanged = 0
+            interval = min(interval * 2, get_max_scan_interval(modbus_item))
+        self._unchanged[modbus_item] = unchanged
+        return interval
+
+    def polled(
+        self,
+        modbus_item: ModbusItem,
+        state=None,
+        previous_state=None,
+        now: float = None,
+    ) -> None:
+        """Schedule the next poll of an item after it has been polled.
+
+        :param modbus_item: definition of modbus item
+        :type modbus_item: ModbusItem
+        :param state: state of the item read by the poll
+        :type state: any
+        :param previous_state: state of the item before it was polled
+        :type previous_state: any
+        :param now: monotonic time, defaults to the current time
+        :type now: float
+        """
+        if now is None:
+            now = time.monotonic()
+        if self._adaptive and modbus_item in self._next_poll:
+            self._interval[modbus_item] = self._adapt(
+                modbus_item, state, previous_state
+            )
+        self._next_poll[modbus_item] = now + self.get_interval(modbus_item)
+
+    def make_due(self, modbus_items: list[ModbusItem]) -> None:
+        """Make items due, so that they are polled with the next tick.
+
+        :param modbus_items: items to be polled
+        :type modbus_items: list[ModbusItem]
+        """
+        for item in modbus_items:
+            self._next_poll.pop(item, None)
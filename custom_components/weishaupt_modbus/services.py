@@ -0,0 +1,128 @@
+"""Services of the integration."""
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .const import CONST, FORMATS, SERVICES
+from .migrate_helpers import create_unique_id
+
+logging.basicConfig()
+log = logging.getLogger(__name__)
+
+
+async def async_refresh(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Re-read the holding registers of all heatpumps from the modbus."""
+    _useless = call
+    for entry in hass.config_entries.async_entries(CONST.DOMAIN):
+        if entry.state is ConfigEntryState.LOADED:
+            await entry.runtime_data.coordinator.async_refresh_holding_registers()
+
+
+WRITE_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(SERVICES.ATTR_VALUES): {
+            cv.entity_id: vol.Any(vol.Coerce(float), cv.string)
+        }
+    }
+)
+
+
+def translate_value(modbus_item, value, coordinator) -> int:
+    """Translate a value as shown in HA into the raw modbus value.
+
+    Values are validated like the entities do, options against the result
+    list and numbers against their fixed or dynamic limits.
+
+    :param modbus_item: definition of modbus item
+    :type modbus_item: ModbusItem
+    :param value: option of a select or value of a number entity
+    :type value: float | str
+    :param coordinator: the coordinator holding the values of dynamic limits
+    :type coordinator: MyCoordinator"""
+    if modbus_item.format == FORMATS.STATUS:
+        val = modbus_item.get_number_from_translation_key(value)
+        if val is None or val == -1:
+            raise ServiceValidationError(
+                f"{value} is not an option of {modbus_item.translation_key}"
+            )
+        return val
+
+    params = modbus_item.params if modbus_item.params is not None else {}
+    divider = params.get("divider", 1)
+    try:
+        number = float(value)
+    except ValueError as exc:
+        raise ServiceValidationError(
+            f"{value} is not a number for {modbus_item.translation_key}"
+        ) from exc
+
+    minimum = params.get("min", -999999)
+    dynamic_min = coordinator.get_value_from_item(params.get("dynamic_min", None))
+    if dynamic_min is not None:
+        minimum = dynamic_min / divider
+    maximum = params.get("max", 999999)
+    dynamic_max = coordinator.get_value_from_item(params.get("dynamic_max", None))
+    if dynamic_max is not None:
+        maximum = dynamic_max / divider
+    if not minimum <= number <= maximum:
+        raise ServiceValidationError(
+            f"{value} is out of the range {minimum}..{maximum}"
+            f" of {modbus_item.translation_key}"
+        )
+    return int(number * divider)
+
+
+async def async_write_registers(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Write the values of several entities, grouped per heatpump."""
+    registry = er.async_get(hass)
+    writes = {}
+    for entity_id, value in call.data[SERVICES.ATTR_VALUES].items():
+        reg_entry = registry.async_get(entity_id)
+        entry = None
+        if reg_entry is not None and reg_entry.config_entry_id is not None:
+            entry = hass.config_entries.async_get_entry(reg_entry.config_entry_id)
+        if (
+            entry is None
+            or entry.domain != CONST.DOMAIN
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            raise HomeAssistantError(f"{entity_id} is no loaded heatpump entity")
+        coordinator = entry.runtime_data.coordinator
+        for item in coordinator.modbus_items:
+            if create_unique_id(entry, item) == reg_entry.unique_id:
+                writes.setdefault(entry.entry_id, (entry, []))[1].append(
+                    (item, translate_value(item, value, coordinator))
+                )
+                break
+        else:
+            raise HomeAssistantError(f"{entity_id} is no modbus entity")
+
+    for entry, values in writes.values():
+        if not await entry.runtime_data.coordinator.write_values(values):
+            raise HomeAssistantError("Writing to the heatpump failed")
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration once."""
+    if hass.services.has_service(CONST.DOMAIN, SERVICES.REFRESH):
+        return
+
+    async def handle_refresh(call: ServiceCall) -> None:
+        await async_refresh(hass, call)
+
+    async def handle_write_registers(call: ServiceCall) -> None:
+        await async_write_registers(hass, call)
+
+    hass.services.async_register(CONST.DOMAIN, SERVICES.REFRESH, handle_refresh)
+    hass.services.async_register(
+        CONST.DOMAIN,
+        SERVICES.WRITE_REGISTERS,
+        handle_write_registers,
+        schema=WRITE_REGISTERS_SCHEMA,
+    )